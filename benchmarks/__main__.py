@@ -0,0 +1,123 @@
+"""
+Micro-benchmarks of the geometry, collision and asset hot paths.
+
+    python -m benchmarks                          # run all, print JSON results
+    python -m benchmarks -o results.json          # ... and save them
+    python -m benchmarks -k gameboard             # only the cases containing "gameboard"
+    python -m benchmarks --compare old.json new.json
+
+Runs headless (SDL dummy drivers). Timings are per call, in microseconds:
+the median and the minimum of several repeats of an automatically sized loop.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import timeit
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"],
+            stderr=subprocess.DEVNULL, text=True).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(function, repeat, min_time):
+    """
+    Per call timings (seconds) of `repeat` loops, each sized to run for at least `min_time`
+    """
+    timer = timeit.Timer(function)
+
+    number = 1
+    while timer.timeit(number) < min_time:
+        number *= 2
+
+    return [total / number for total in timer.repeat(repeat, number)], number
+
+
+def run(cases, repeat, min_time):
+    results = []
+    for name, setup in cases.items():
+        timings, number = measure(setup(), repeat, min_time)
+        results.append({
+            "name": name,
+            "median_us": statistics.median(timings) * 1e6,
+            "min_us": min(timings) * 1e6,
+            "stdev_us": statistics.stdev(timings) * 1e6 if len(timings) > 1 else 0,
+            "loops": number,
+            "repeat": repeat,
+        })
+        print("{:40} {:12.2f} us".format(name, results[-1]["median_us"]), file=sys.stderr)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "results": results,
+    }
+
+
+def compare(old_path, new_path, threshold):
+    """
+    Prints the median change of every case present in both files. Returns the number of regressions.
+    """
+    with open(old_path) as old_file, open(new_path) as new_file:
+        old = {result["name"]: result for result in json.load(old_file)["results"]}
+        new = {result["name"]: result for result in json.load(new_file)["results"]}
+
+    regressions = 0
+    for name in [name for name in old if name in new]:
+        ratio = new[name]["median_us"] / old[name]["median_us"]
+        regressed = ratio > 1 + threshold
+        regressions += regressed
+
+        print("{:40} {:12.2f} -> {:12.2f} us  {:+7.1%}{}".format(
+            name, old[name]["median_us"], new[name]["median_us"], ratio - 1,
+            "  REGRESSION" if regressed else ""))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="keyword", default="", help="only run the cases containing this text")
+    parser.add_argument("-o", dest="output", help="write the JSON results to this file")
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.05, help="minimum duration (s) of one repeat")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="compare two result files")
+    parser.add_argument("--threshold", type=float, default=0.1, help="slowdown reported as a regression")
+    args = parser.parse_args()
+
+    if args.compare:
+        sys.exit(1 if compare(*args.compare, args.threshold) else 0)
+
+    pygame.init()
+    pygame.display.set_mode((1280, 720))
+
+    from .cases import CASES
+    cases = {name: setup for name, setup in CASES.items() if args.keyword in name}
+
+    report = json.dumps(run(cases, args.repeat, args.min_time), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report)
+    else:
+        print(report)
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
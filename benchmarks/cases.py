@@ -0,0 +1,190 @@
+"""
+Benchmark cases. Each case is a function returning a zero-argument callable to be timed,
+so that the setup is not measured.
+"""
+import random
+
+import pygame
+
+from skater import image, image_paths
+from skater.camera import Camera
+from skater.game import Game
+from skater.gameboard import GameBoard
+from skater.image import Image
+from skater.input_dispatcher import EventBatch
+from skater.obstacles import Obstacle
+from skater.obstacles_list import OBSTACLES
+from skater.preloader import preloader
+from skater.rendering.edge import Edge
+from skater.rendering.point import Point
+from skater.rendering.shape import Polygon, rectangle
+
+CASES = {}
+
+def case(name):
+    def register(setup):
+        CASES[name] = setup
+        return setup
+    return register
+
+
+class Body:
+    """
+    Anything with a `rect`, like the player
+    """
+    def __init__(self, rect):
+        self.rect = rect
+
+
+def player_rect():
+    return rectangle(Point(100, 450), Point(180, 600))
+
+
+def level_1():
+    """
+    The game's level as `Game` loads it: platforms, lines and moving platforms
+    """
+    level = preloader.load_level(OBSTACLES, preloader.level_cache_path)
+    gameboard = GameBoard([], lines=level.lines, moving=level.moving)
+    gameboard.set_obstacles(level.obstacles, level.index)
+    return gameboard
+
+
+def generated_obstacles(count, seed=0):
+    """
+    A long level of platforms, laid out from left to right
+    """
+    rng = random.Random(seed)
+    return [
+        Obstacle(
+            Image.create((rng.randint(50, 400), rng.randint(20, 60)), (0, 0, 0)),
+            x = 300 * i + rng.randint(0, 100),
+            y = rng.randint(300, 900))
+        for i in range(count)]
+
+
+@case("edge.distance_x")
+def edge_distance_x():
+    edge = Edge(Point(100, 0), Point(0, 100))
+    point = Point(25, 25)
+    return lambda: edge.distance_x(point)
+
+
+@case("edge.distance_y")
+def edge_distance_y():
+    edge = Edge(Point(100, 0), Point(0, 100))
+    point = Point(25, 25)
+    return lambda: edge.distance_y(point)
+
+
+@case("polygon.distance_x")
+def polygon_distance_x():
+    first = Polygon([Point(0, 0), Point(40, 10), Point(30, 50), Point(5, 40)])
+    other = Polygon([Point(100, 0), Point(140, 20), Point(120, 60)])
+    return lambda: first.distance_x(other)
+
+
+@case("polygon.distance_y")
+def polygon_distance_y():
+    first = Polygon([Point(0, 0), Point(40, 10), Point(30, 50), Point(5, 40)])
+    other = Polygon([Point(0, 100), Point(40, 120), Point(20, 160)])
+    return lambda: first.distance_y(other)
+
+
+@case("rectangle.distance_x")
+def rectangle_distance_x():
+    first = player_rect()
+    other = rectangle(Point(300, 400), Point(400, 700))
+    return lambda: first.distance_x(other)
+
+
+@case("rectangle.distance_y")
+def rectangle_distance_y():
+    first = player_rect()
+    other = rectangle(Point(0, 650), Point(1000, 700))
+    return lambda: first.distance_y(other)
+
+
+@case("obstacle.is_under")
+def obstacle_is_under():
+    obstacle = Obstacle(Image.create((1000, 50), (0, 0, 0)), x = 0, y = 650)
+    rect = player_rect()
+    return lambda: obstacle.is_under(rect)
+
+
+@case("obstacle.is_to_the_right")
+def obstacle_is_to_the_right():
+    obstacle = Obstacle(Image.create((100, 300), (0, 0, 0)), x = 300, y = 400)
+    rect = player_rect()
+    return lambda: obstacle.is_to_the_right(rect)
+
+
+@case("obstacle.is_to_the_left")
+def obstacle_is_to_the_left():
+    obstacle = Obstacle(Image.create((50, 300), (0, 0, 0)), x = 0, y = 400)
+    rect = player_rect()
+    return lambda: obstacle.is_to_the_left(rect)
+
+
+def gameboard_sweeps(gameboard):
+    """
+    The collision queries of a single `Player.move_swept`
+    """
+    player = Body(player_rect())
+
+    def sweeps():
+        gameboard.sweep(player, (8, 0))
+        gameboard.ramp_limit(player)
+        gameboard.sunk_limit(player)
+        gameboard.sweep(player, (0, 20))
+
+    return sweeps
+
+
+@case("gameboard.sweeps[level_1]")
+def gameboard_sweeps_level():
+    return gameboard_sweeps(level_1())
+
+
+@case("gameboard.sweeps[1000_obstacles]")
+def gameboard_sweeps_large():
+    return gameboard_sweeps(GameBoard(generated_obstacles(1000)))
+
+
+@case("image.create[2000x50]")
+def image_create():
+    return lambda: Image.create((2000, 50), (0, 0, 0))
+
+
+@case("image.load[cached]")
+def image_load_cached():
+    Image.load(image_paths.PLAYER_MAIN)
+    return lambda: Image.load(image_paths.PLAYER_MAIN)
+
+
+@case("image.load[uncached]")
+def image_load_uncached():
+    def load():
+        Image.surface_cache.clear()
+        Image.load(image_paths.PLAYER_MAIN)
+
+    return load
+
+
+@case("camera.adjust")
+def camera_adjust():
+    camera = Camera()
+    screen = pygame.display.get_surface()
+    player = Body(player_rect().shifted(x_shift=1000))
+    return lambda: camera.adjust(screen, player)
+
+
+@case("game.display_frame")
+def game_display_frame():
+    screen = pygame.display.get_surface()
+    background_image = image.Image.load(image_paths.BACKGROUND)
+
+    game = Game()
+    game.run(screen, EventBatch())
+
+    return lambda: game.display_frame(screen, background_image)
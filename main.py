@@ -1,5 +1,7 @@
+import atexit
 import os 
 import string
+import sys
 import pygame
 from pygame.locals import *
 from skater.game import *
@@ -9,6 +11,12 @@ from skater.exit import Exit
 from skater.router import Router
 from skater.destination import Destination
 from skater import image, image_paths
+from skater.dirty_rects import dirty_rects
+from skater.input_dispatcher import InputDispatcher
+from skater.preloader import preloader
+from skater.profiler import profiler
+from skater.render_functions import fonts, text_surfaces
+from skater.replay import Recording, Replay
 
 size = width, height = (1280, 720)
 
@@ -17,12 +25,51 @@ pygame.init()
 pygame.font.init()
 screen = pygame.display.set_mode(size)
 
+# `python main.py --dirty-rects` only pushes the changed parts of the window to the screen
+dirty_rects.enabled = "--dirty-rects" in sys.argv
+
+# `python main.py --profile` records frame timings (F3 toggles the overlay), saved to profile.csv / .json on exit
+profiler.enabled = "--profile" in sys.argv
+for cache in [image.Image.surface_cache, fonts, text_surfaces]:
+    profiler.watch_cache(cache)
+if profiler.enabled:
+    atexit.register(profiler.dump_csv, "profile.csv")
+    atexit.register(profiler.dump_json, "profile.json")
+
+
+def option_value(name):
+    """
+    The command line argument following `name`, None if `name` is not present
+    """
+    if name in sys.argv[:-1]:
+        return sys.argv[sys.argv.index(name) + 1]
+
+
+# `python main.py --record PATH` saves the input of the last game played to PATH on exit
+record_path = option_value("--record")
+recording = None
+if record_path:
+    atexit.register(lambda: recording and recording.save(record_path))
+
+# `python main.py --level PATH` streams the level from a level file (see `skater.level_stream`)
+level_path = option_value("--level")
+
+# `python main.py --pixel-collision` collides by the images' opaque pixels instead of the obstacles' shapes
+pixel_collision = "--pixel-collision" in sys.argv
+
+# `python main.py --replay PATH [--max-speed]` replays a recorded game before handing over the controls
+replay_path = option_value("--replay")
+
 background_image = image.Image.load(image_paths.BACKGROUND)
 
 done = False
 clock = pygame.time.Clock()
+dispatcher = InputDispatcher()
 game_state = Menu()
 
+# load the game in the background while the player is choosing in the menu
+preloader.start_game_assets()
+
 router = Router({
     Destination.MENU: Menu,
     Destination.CONTROLS: Controls,
@@ -39,16 +86,48 @@ while not done:
     # reroute only if the current `game_state` pointed to a destination
     if destination:
         game_state = router.route(destination)
+        dirty_rects.invalidate()
 
-    # Get the next queued event 
-    event = pygame.event.poll()
-    
-    game_state.run(screen, event)
+        if isinstance(game_state, Menu):
+            preloader.start_game_assets()
+
+        if isinstance(game_state, Game):
+            game_state.level_path = level_path
+            game_state.gameboard.pixel_collision = pixel_collision
+
+            if record_path:
+                recording = game_state.recording = Recording()
+
+            if replay_path:
+                Replay(Recording.load(replay_path), realtime="--max-speed" not in sys.argv).run(
+                    game_state, screen, background_image)
+                replay_path = None
+
+    # Get all the events queued since the previous frame
+    with profiler.phase("events"):
+        events = dispatcher.poll()
 
-    game_state.display_frame(screen, background_image)
+    if profiler.enabled and events.key_pressed([pygame.K_F3]):
+        profiler.show_overlay = not profiler.show_overlay
+
+        # the overlay is drawn into the frame before it is pushed to the window - one display update per frame
+        if profiler.show_overlay:
+            dirty_rects.overlay = profiler.draw_overlay
+        else:
+            # the frame under the overlay replaces it
+            dirty_rects.overlay = None
+            dirty_rects.invalidate(dirty_rects.overlay_area)
     
-    # Limit to N frames per second
+    with profiler.phase("run"):
+        game_state.run(screen, events)
+
+    with profiler.phase("display_frame"):
+        game_state.display_frame(screen, background_image)
+
+    # Limit to N frames per second (rendering only - `Game` simulates physics at a fixed rate)
     clock.tick(90)
 
+    profiler.end_frame()
+
 
 pygame.quit()
\ No newline at end of file
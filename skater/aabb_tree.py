@@ -0,0 +1,278 @@
+class _Node:
+    def __init__(self, box, item=None):
+        # (left, top, right, bottom); a leaf's box is its item's fattened box
+        self.box = box
+        self.item = item
+
+        self.parent = None
+        self.left = None
+        self.right = None
+
+        # 0 for leaves
+        self.height = 0
+
+    def is_leaf(self):
+        return self.left is None
+
+
+class AABBTree:
+    """
+    A dynamic bounding volume tree of moving items (e.g. moving obstacles).
+
+    Every item is a leaf holding its box fattened by `MARGIN` pixels and stretched in the direction it
+    moves. An item moving within its fat box doesn't touch the tree at all, one leaving it is removed
+    and inserted again. The tree is kept balanced by rotations, so inserting, moving and removing
+    an item are O(log n).
+
+    Like `SpatialHash`, queries return a superset (by the fat boxes) of the items actually overlapping.
+    """
+    MARGIN = 8
+
+    # how many ticks of movement ahead a fat box covers
+    PREDICTION = 2
+
+    def __init__(self, margin=MARGIN):
+        self.margin = margin
+        self.root = None
+
+        # id(item) -> its leaf
+        self.leaves = {}
+
+    def __len__(self):
+        return len(self.leaves)
+
+    def height(self):
+        return -1 if self.root is None else self.root.height
+
+    def fat_box(self, item):
+        return self.leaves[id(item)].box
+
+    def fatten(self, rect, displacement=(0, 0)):
+        dx, dy = (self.PREDICTION * delta for delta in displacement)
+        return (rect.left - self.margin + min(dx, 0), rect.top - self.margin + min(dy, 0),
+                rect.right + self.margin + max(dx, 0), rect.bottom + self.margin + max(dy, 0))
+
+    def insert(self, item, rect):
+        """
+        Adds `item` with its bounding box `rect` (anything with left / right / top / bottom)
+        """
+        leaf = _Node(self.fatten(rect), item)
+        self.leaves[id(item)] = leaf
+        self.insert_leaf(leaf)
+
+    def remove(self, item):
+        self.remove_leaf(self.leaves.pop(id(item)))
+
+    def move(self, item, rect, displacement=(0, 0)):
+        """
+        Updates the box of a moved `item`. The tree only changes if `rect` left the item's fat box.
+
+        Returns True if the item was reinserted.
+        """
+        leaf = self.leaves[id(item)]
+        if contains(leaf.box, (rect.left, rect.top, rect.right, rect.bottom)):
+            return False
+
+        self.remove_leaf(leaf)
+        leaf.box = self.fatten(rect, displacement)
+        self.insert_leaf(leaf)
+        return True
+
+    def query(self, left, top, right, bottom):
+        """
+        Items whose fat box overlaps the <left, right> x <top, bottom> area
+        """
+        box = (left, top, right, bottom)
+        found = []
+        nodes = [self.root] if self.root is not None else []
+        while nodes:
+            node = nodes.pop()
+            if not overlaps(node.box, box):
+                continue
+
+            if node.is_leaf():
+                found.append(node.item)
+            else:
+                nodes.append(node.left)
+                nodes.append(node.right)
+
+        return found
+
+    def ray_cast(self, start, end):
+        """
+        (fraction of the way from `start` to `end`, item) of the items whose fat box the segment
+        crosses, the closest first
+        """
+        found = []
+        nodes = [self.root] if self.root is not None else []
+        while nodes:
+            node = nodes.pop()
+            fraction = ray_box(start, end, node.box)
+            if fraction is None:
+                continue
+
+            if node.is_leaf():
+                found.append((fraction, node.item))
+            else:
+                nodes.append(node.left)
+                nodes.append(node.right)
+
+        return sorted(found, key=lambda hit: hit[0])
+
+    def insert_leaf(self, leaf):
+        if self.root is None:
+            self.root = leaf
+            leaf.parent = None
+            return
+
+        # descend to the sibling which makes the tree grow the least (by the boxes' perimeters)
+        box = leaf.box
+        node = self.root
+        while not node.is_leaf():
+            combined = perimeter(union(node.box, box))
+
+            # pairing the leaf with `node` itself, or pushing it down - which enlarges `node` anyway
+            cost = 2 * combined
+            inheritance = 2 * (combined - perimeter(node.box))
+
+            cost_left = self.descent_cost(node.left, box) + inheritance
+            cost_right = self.descent_cost(node.right, box) + inheritance
+            if cost < cost_left and cost < cost_right:
+                break
+
+            node = node.left if cost_left < cost_right else node.right
+
+        sibling = node
+        parent = _Node(union(box, sibling.box))
+        self.replace(sibling, parent)
+        parent.left, parent.right = sibling, leaf
+        sibling.parent = leaf.parent = parent
+        parent.height = sibling.height + 1
+
+        self.refit(parent)
+
+    @staticmethod
+    def descent_cost(child, box):
+        enlarged = perimeter(union(child.box, box))
+        if child.is_leaf():
+            return enlarged
+
+        return enlarged - perimeter(child.box)
+
+    def remove_leaf(self, leaf):
+        if leaf is self.root:
+            self.root = None
+            return
+
+        # the leaf's sibling takes the place of their parent
+        parent = leaf.parent
+        sibling = parent.right if parent.left is leaf else parent.left
+        self.replace(parent, sibling)
+        leaf.parent = None
+
+        if sibling.parent is not None:
+            self.refit(sibling.parent)
+
+    def replace(self, old, new):
+        """
+        Puts `new` in the place of `old` under `old`'s parent
+        """
+        parent = old.parent
+        new.parent = parent
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+
+    def refit(self, node):
+        """
+        Rebalances and updates the boxes and heights from `node` up to the root
+        """
+        while node is not None:
+            node = self.balance(node)
+            fit(node)
+            node = node.parent
+
+    def balance(self, node):
+        """
+        Rotates the taller child of `node` up if the children's heights differ by more than 1.
+        Returns the node now in `node`'s place.
+        """
+        if node.is_leaf() or node.height < 2:
+            return node
+
+        difference = node.right.height - node.left.height
+        if difference > 1:
+            return self.rotate(node, "right")
+        if difference < -1:
+            return self.rotate(node, "left")
+
+        return node
+
+    def rotate(self, node, side):
+        """
+        Moves `node`'s child on `side` into `node`'s place. The child keeps its taller child,
+        its shorter one goes to `node`.
+        """
+        child = getattr(node, side)
+        self.replace(node, child)
+
+        taller, shorter = (child.left, child.right) if child.left.height > child.right.height \
+            else (child.right, child.left)
+
+        child.left, child.right = node, taller
+        node.parent = child
+        setattr(node, side, shorter)
+        shorter.parent = node
+
+        fit(node)
+        fit(child)
+        return child
+
+
+def fit(node):
+    node.box = union(node.left.box, node.right.box)
+    node.height = 1 + max(node.left.height, node.right.height)
+
+
+def union(a, b):
+    return (min(a[0], b[0]), min(a[1], b[1]), max(a[2], b[2]), max(a[3], b[3]))
+
+
+def perimeter(box):
+    return 2 * (box[2] - box[0] + box[3] - box[1])
+
+
+def contains(outer, inner):
+    return outer[0] <= inner[0] and outer[1] <= inner[1] and outer[2] >= inner[2] and outer[3] >= inner[3]
+
+
+def overlaps(a, b):
+    return a[0] <= b[2] and a[2] >= b[0] and a[1] <= b[3] and a[3] >= b[1]
+
+
+def ray_box(start, end, box):
+    """
+    Fraction <0, 1> of the way from `start` to `end` (x, y) where the segment enters `box`
+    (left, top, right, bottom), 0 if it starts inside, None if it misses it
+    """
+    entry, exit = 0, 1
+    for origin, target, low, high in ((start[0], end[0], box[0], box[2]), (start[1], end[1], box[1], box[3])):
+        delta = target - origin
+        if delta == 0:
+            if origin < low or origin > high:
+                return None
+            continue
+
+        near, far = (low - origin) / delta, (high - origin) / delta
+        if near > far:
+            near, far = far, near
+
+        entry = max(entry, near)
+        exit = min(exit, far)
+        if entry > exit:
+            return None
+
+    return entry
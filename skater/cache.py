@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A bounded key -> value store which evicts the least recently used entry
+    once `capacity` is exceeded.
+
+    Keeps `hits` / `misses` counters so the cache efficiency can be inspected.
+    """
+    def __init__(self, capacity=64):
+        assert capacity > 0, "Cache capacity has to be positive, got {}".format(capacity)
+        self.capacity = capacity
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, key):
+        return key in self.entries
+
+    def get(self, key, factory):
+        """
+        Returns the value stored under `key`.
+
+        On a miss, `factory()` is called to build the value, which is stored before returning.
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+
+        self.misses += 1
+        value = factory()
+        self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+
+        while len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    def discard(self, key):
+        """
+        Drops the entry stored under `key`, if any
+        """
+        self.entries.pop(key, None)
+
+    def clear(self):
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
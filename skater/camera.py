@@ -1,4 +1,8 @@
 
+from .rendering.point import Point
+from .rendering import shape
+
+
 class Camera:
     LAG = 0.01
 
@@ -6,6 +10,14 @@ class Camera:
         self.x = 0
         self.y = 0        
 
+    def viewport(self, screen_rect):
+        """
+        The part of the world currently visible on the screen, in world coordinates
+        """
+        return shape.rectangle(
+            Point(self.x, self.y),
+            Point(self.x + screen_rect.width, self.y + screen_rect.height))
+
     def adjust(self, screen, player):
         self.adjust_x(screen.get_rect(), player.rect)
         self.adjust_y(screen.get_rect(), player.rect)
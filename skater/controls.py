@@ -34,22 +34,23 @@ class Controls(State):
             if self.active_state == "Back": return Destination.MENU
             
     
-    def run(self, screen, event): 
+    def run(self, screen, events): 
         
-        if event.type == pygame.KEYDOWN:
+        for event in events:
+            if event.type == pygame.KEYDOWN:
 
-            if event.key in CONTROLS["M_DOWN"] and self.selected_index < (len(self.CONTROLS_DESC) - 1):
-                self.selected_index = self._next_index()
+                if event.key in CONTROLS["M_DOWN"] and self.selected_index < (len(self.CONTROLS_DESC) - 1):
+                    self.selected_index = self._next_index()
 
-            if event.key in CONTROLS["M_UP"] and self.selected_index > 0:
-                self.selected_index = self._previous_index()
+                if event.key in CONTROLS["M_UP"] and self.selected_index > 0:
+                    self.selected_index = self._previous_index()
 
-            if event.key in CONTROLS["M_SELECT"]:
-               self.active_state = self.CONTROLS_DESC[self.selected_index][0]
+                if event.key in CONTROLS["M_SELECT"]:
+                   self.active_state = self.CONTROLS_DESC[self.selected_index][0]
 
 
     def display_frame(self, screen, background_image):
-        font = pygame.font.SysFont('Arial', 30)
+        font = get_font('Arial', 30)
         BLACK = (0, 0, 0); WHITE = (255, 255, 255); RED = (255, 0, 0)
         selected_marker = ">"; unselected_marker = " "
 
@@ -64,4 +65,4 @@ class Controls(State):
 
                 draw_text(screen, text, font, BLACK, "L", 550 + j*200, 250 + i*50)
 
-        pygame.display.update()
+        dirty_rects.update_display()
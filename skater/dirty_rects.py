@@ -0,0 +1,98 @@
+import pygame
+
+from .profiler import profiler
+
+
+class DirtyRects:
+    """
+    Keeps track of the screen regions changed during a frame, so that only those
+    are pushed to the window by `update_display`.
+
+    Sprites and labels are drawn through `draw`, which compares them with what the same key drew
+    in the previous frame - a region is only pushed if its content changed, plus the region a moved
+    or vanished sprite left. Regions marked by `add` are pushed in the current frame and the next one
+    (to erase them). Everything else is assumed to be repainted identically each frame
+    (e.g. a cleared or static background).
+
+    Disabled by default - `update_display` then updates the whole window.
+    """
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.current = []
+        self.previous = []
+        self.full_update = True
+
+        # key -> (rect, content) drawn by `draw` in the previous / current frame
+        self.drawn = {}
+        self.drawing = {}
+
+        # regions changed by `draw` in the current frame
+        self.changed = []
+
+        # drawn on top of every frame right before it is pushed (e.g. the profiler's overlay):
+        # called with the screen, returns the area drawn onto
+        self.overlay = None
+        self.overlay_area = None
+
+    def add(self, rect):
+        """
+        Marks a drawn region (a pygame.Rect, as returned by `Surface.blit`)
+        """
+        self.current.append(rect)
+
+    def draw(self, key, rect, content=None):
+        """
+        Marks a region drawn by `key` (e.g. a sprite or a label, drawn once per frame), showing `content`.
+        It is only pushed if `key` drew something else, or somewhere else, in the previous frame.
+        """
+        self.drawing[key] = (rect, content)
+
+        previous = self.drawn.get(key)
+        if previous != (rect, content):
+            self.changed.append(rect)
+            if previous is not None:
+                self.changed.append(previous[0])
+
+    def invalidate(self, rect=None):
+        """
+        `rect` will be updated at the end of the frame, the whole window if None
+        (e.g. the camera moved, the state changed)
+        """
+        if rect is None:
+            self.full_update = True
+        else:
+            self.changed.append(rect)
+
+    def update_display(self):
+        """
+        Pushes the frame to the window. Returns the updated rects, None if the whole window was updated.
+        """
+        with profiler.phase("display_update"):
+            if self.overlay is not None:
+                self.overlay_area = self.overlay(pygame.display.get_surface())
+                self.changed.append(self.overlay_area)
+
+            # whatever isn't drawn anymore leaves its region behind
+            for key, (rect, _) in self.drawn.items():
+                if key not in self.drawing:
+                    self.changed.append(rect)
+
+            if self.enabled and not self.full_update:
+                rects = self.previous + self.current + self.changed
+                pygame.display.update(rects)
+            else:
+                rects = None
+                pygame.display.update()
+
+        self.previous = self.current
+        self.current = []
+        self.drawn = self.drawing
+        self.drawing = {}
+        self.changed = []
+        self.full_update = False
+
+        return rects
+
+
+# shared by all states drawing onto the game window
+dirty_rects = DirtyRects()
@@ -7,7 +7,7 @@ class Exit(State):
     def next_destination(self):
         pygame.quit()            
     
-    def run(self, screen, event): 
+    def run(self, screen, events): 
         pass
 
     def display_frame(self, screen, background_image):
@@ -1,3 +1,5 @@
+import time
+
 from .state import *
 from .player import *
 from .gameboard import *
@@ -5,17 +7,46 @@ from .obstacles import *
 from .obstacles_list import *
 from .score import *
 from .camera import *
+from .input_dispatcher import EventBatch
+from .level_layer import LevelLayer
+from .level_stream import LevelFile, LevelStreamer
+from .preloader import preloader
+from .profiler import profiler
 from skater.destination import Destination
 from . import image, image_paths
+from .rendering.point import Point
 
 class Game(State):
 
-    def __init__(self):
+    # physics is simulated in fixed ticks (seconds), independent of the rendering frame rate
+    TICK = 1 / 90
+
+    # after a very slow frame, the simulation skips ahead instead of trying to catch up
+    MAX_TICKS_PER_FRAME = 5
+
+    def __init__(self, clock=time.perf_counter, level_path=None, level_cache_path=None, pixel_collision=False):
+        """
+        `clock` returns the current time in seconds
+
+        `level_path` - a level file (see `level_stream`) streamed around the camera, instead of `OBSTACLES`
+
+        `level_cache_path` - where `OBSTACLES` are compiled to by `LevelCache`, the preloader's path by default
+
+        `pixel_collision` - collide by the images' opaque pixels instead of the shapes, see `GameBoard.pixel_sweep`
+        """
         State.__init__(self)
         self.active_state = "game"
+
+        # images preloaded while the menu was showing
+        preloader.collect_images()
         self.level = 0
 
-        self.gameboard = GameBoard([])
+        self.gameboard = GameBoard([], pixel_collision=pixel_collision)
+        self.level_layer = LevelLayer([])
+
+        self.level_path = level_path
+        self.level_cache_path = level_cache_path or preloader.level_cache_path
+        self.streamer = None
 
         self.player = Player(speed_unit = 8)
         self.player.rect.x = 100
@@ -28,6 +59,24 @@ class Game(State):
         self.new_level = True
 
         self.camera = Camera()
+        self.drawn_camera_position = None
+
+        # fixed timestep state
+        self.clock = clock
+        self.last_time = None
+        self.accumulator = 0
+        self.pending_events = EventBatch()
+        self.ticks = 0
+
+        # `replay.Recording` collecting the input of every tick
+        self.recording = None
+
+        # iterator of `simulation.InputState`s used instead of the live input, one per tick
+        self.replay = None
+
+        # positions before the last tick and how far past them a frame should be drawn <0, 1>
+        self.previous_positions = self.current_positions()
+        self.interpolation = 1
 
 
     def next_destination(self):
@@ -35,59 +84,158 @@ class Game(State):
         elif self.active_state == "Exit": return Destination.EXIT
 
     
-    def run(self, screen, event):
-        if event.type == pygame.KEYDOWN and event.key in CONTROLS["QUIT"]:
+    def run(self, screen, events):
+        if events.key_pressed(CONTROLS["QUIT"]):
             self.active_state = "Exit"
         
         if self.new_level:
-            self.level += 1
-            self.gameboard.obstacles = self.create_obstacles()
-            self.player.rect.x = 100
-            self.player.rect.bottom = 500
-            self.new_level = False
+            self.start_level()
 
         if not self.game_over:
             if not self.won_level:
-
-                # changes x and y parameters of camera depending on the location of the player on the screen
-                self.camera.adjust(screen, self.player)
-
-                self.player.move(screen, event, self.gameboard)
-                self.check_game_result()
+                self.advance(screen, events)
 
             # You won level screen - press any key to move to next level
             else: 
-                self.won_level_continue(event)
+                self.last_time = None
+                self.won_level_continue(events)
 
         # Game over screen action - press any key and move to menu
         else:
-            self.game_over_continue(event)
-    
-    # return all obstacle objects listed in OBSTACLES in obstacles_list.py
-    def create_obstacles(self):
-        return [
-            Obstacle(
-                image = image.Image.create( (obstacle['size']['width'], obstacle['size']['height']) ),
-                x = obstacle['position']['x'],
-                y = obstacle['position']['y'])
-            for obstacle in list(OBSTACLES.values()) if obstacle['type'] == 1]  
+            self.last_time = None
+            self.game_over_continue(events)
+
+
+    def start_level(self):
+        self.level += 1
+
+        if self.level_path is None:
+            level = preloader.load_level(OBSTACLES, self.level_cache_path)
+            self.gameboard.set_obstacles(level.obstacles, level.index)
+            self.gameboard.lines = level.lines
+            self.gameboard.moving = level.moving
+        else:
+            # obstacles are loaded by `stream_level` as the camera moves
+            if self.streamer is not None:
+                self.streamer.level_file.close()
+            self.streamer = LevelStreamer(LevelFile(self.level_path))
+            self.gameboard.obstacles = []
+            self.gameboard.lines = []
+            self.gameboard.moving = []
+
+        self.level_layer = LevelLayer(self.gameboard.obstacles + self.gameboard.lines)
+        self.player.rect.x = 100
+        self.player.rect.bottom = 500
+        self.previous_positions = self.current_positions()
+        self.new_level = False
+
+
+    def advance(self, screen, events):
+        """
+        Runs as many physics ticks as fit into the time elapsed since the previous frame
+        """
+        now = self.clock()
+        elapsed = self.TICK if self.last_time is None else now - self.last_time
+        self.last_time = now
+
+        self.accumulator = min(
+            self.accumulator + elapsed,
+            self.MAX_TICKS_PER_FRAME * self.TICK)
 
+        # the frame's events go to its first tick (or wait for the next frame if no tick runs)
+        # -> none is lost or repeated, whatever the frame rate
+        self.pending_events.extend(events)
 
+        while self.accumulator >= self.TICK and not self.game_over:
+            self.tick(screen, *self.next_input())
+            self.accumulator -= self.TICK
+
+        self.interpolation = self.accumulator / self.TICK
+
+
+    def next_input(self):
+        """
+        The events and keystate for the next tick - the replayed ones, if a replay is running
+        """
+        if self.replay is not None:
+            input_state = next(self.replay, None)
+            if input_state is not None:
+                return input_state.events, input_state
+
+            # the replay is over -> back to the live input
+            self.replay = None
+
+        events, self.pending_events = self.pending_events, EventBatch()
+        return events, None
+
+
+    def tick(self, screen, events, keystate=None):
+        """
+        A single physics step. `screen` is only used for its size.
+
+        `keystate` - see `Player.move`, the keyboard is read if None
+        """
+        if keystate is None:
+            keystate = pygame.key.get_pressed()
+
+        if self.recording is not None:
+            self.recording.record(events, keystate)
+
+        self.ticks += 1
+        self.previous_positions = self.current_positions()
+
+        # changes x and y parameters of camera depending on the location of the player on the screen
+        with profiler.phase("camera"):
+            self.camera.adjust(screen, self.player)
+
+        if self.streamer is not None:
+            with profiler.phase("streaming"):
+                self.stream_level(screen)
+
+        with profiler.phase("physics"):
+            self.gameboard.update_moving(riders=[self.player])
+            self.player.move(screen, events, self.gameboard, keystate)
+            self.check_game_result()
+
+
+    def stream_level(self, screen):
+        """
+        Loads the level chunks the camera approaches, evicts the ones it left behind
+        """
+        added, removed = self.streamer.update(self.camera.viewport(screen.get_rect()))
+        if added or removed:
+            self.gameboard.update_obstacles(added, removed)
+            self.level_layer.update_obstacles(added, removed)
+
+
+    def current_positions(self):
+        return (self.player.rect.x, self.player.rect.y, self.camera.x, self.camera.y)
+
+
+    def interpolated_positions(self):
+        """
+        Player and camera positions between the last two ticks, used for drawing
+        """
+        return [
+            previous + (current - previous) * self.interpolation
+            for previous, current in zip(self.previous_positions, self.current_positions())]
+    
     def check_game_result(self):
         if self.player.is_crashed():
             self.game_over = True
 
     
-    def game_over_continue(self, event):
-        if event.type == pygame.KEYDOWN:
-            if event.key in CONTROLS["YES"]:
-                self.active_state = "Menu"
-            elif event.key == pygame.K_n:
-                self.exit = True
+    def game_over_continue(self, events):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key in CONTROLS["YES"]:
+                    self.active_state = "Menu"
+                elif event.key == pygame.K_n:
+                    self.exit = True
 
 
-    def won_level_continue(self, event):
-        if event.type == pygame.KEYDOWN and event.key in CONTROLS["YES"]: 
+    def won_level_continue(self, events):
+        if events.key_pressed(CONTROLS["YES"]): 
             self.won_level = False
             self.new_level = True
 
@@ -97,7 +245,7 @@ class Game(State):
         WHITE = (255, 255, 255)
         BLACK = (0, 0, 0)
         
-        font = pygame.font.SysFont('Arial', 40)
+        font = get_font('Arial', 40)
 
         # clean game area
         screen.fill(WHITE, (0, 0, screen.get_size()[0], screen.get_size()[1]))
@@ -123,19 +271,34 @@ class Game(State):
 
             self.draw_main_game(screen, BLACK)
 
-        pygame.display.update()
+        dirty_rects.update_display()
 
     
     def draw_main_game(self, screen, color):
-
-        # draw sprites (player and obstacles)
-        draw_rect(screen, self.camera, self.player.rect, self.player.image)
-
-        for sprite in self.gameboard.obstacles:
-            draw_rect(screen, self.camera, sprite.rect, sprite.image) 
-
-        # Draw scores in right top corner
-        self.draw_game_results(screen, self.score, color)
+        with profiler.phase("draw"):
+            player_x, player_y, camera_x, camera_y = self.interpolated_positions()
+            camera = Camera()
+            camera.x, camera.y = camera_x, camera_y
+
+            # a moving camera shifts everything on the screen -> update the whole window
+            camera_position = (camera.x, camera.y)
+            if camera_position != self.drawn_camera_position:
+                dirty_rects.invalidate()
+                self.drawn_camera_position = camera_position
+
+            # draw sprites (player and obstacles)
+            draw_rect(screen, camera, Point(player_x, player_y), self.player.image, key=self.player)
+
+            # obstacles are static -> draw the pre-rendered chunks of the level visible through the camera
+            self.level_layer.draw(screen, camera)
+
+            # moving obstacles can't be pre-rendered -> drawn one by one, the ones around the viewport only
+            viewport = camera.viewport(screen.get_rect())
+            for obstacle in self.gameboard.tree.query(viewport.left, viewport.top, viewport.right, viewport.bottom):
+                draw_rect(screen, camera, obstacle.rect, obstacle.image, key=obstacle)
+
+            # Draw scores in right top corner
+            self.draw_game_results(screen, self.score, color)
   
 
     def draw_ground(self, screen, color):
@@ -143,7 +306,7 @@ class Game(State):
 
 
     def draw_game_results(self, screen, score, color):
-        font = pygame.font.SysFont('Arial', 20)
+        font = get_font('Arial', 20)
         game_results_list = ["Level: {}".format(self.level),
                              "Lives: {}".format(str(score.number_of_lives)),
                              "Score: {}".format(str(score.total_score))]
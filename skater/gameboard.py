@@ -1,62 +1,471 @@
+from math import inf
+
+from .aabb_tree import AABBTree, ray_box
+from .obstacles import LineObstacle, MovingObstacle, Obstacle
+from .profiler import profiler
+from .segment_index import SegmentIndex
+from .spatial_hash import SpatialHash
+
+
+class Contact:
+    """
+    The first obstacle hit by a moving box: after `time` <0, 1> of its displacement,
+    on the obstacle's side facing `normal` - e.g. (0, -1) is the top of a floor.
+    """
+    def __init__(self, time, normal, obstacle):
+        self.time = time
+        self.normal = normal
+        self.obstacle = obstacle
+
+    def __repr__(self):
+        return "Contact: {}, {}, {}".format(self.time, self.normal, self.obstacle)
+
 
 class GameBoard:
     # infinities to avoid crashes on empty sequence computations
     MIN_POSITION = -2 ** 31
     MAX_POSITION = 2 ** 31
 
-    def __init__(self, obstacles):
+    # size (in pixels) of a single spatial index cell
+    CELL_SIZE = 256
+
+    # how far up (in pixels) a line can be from the player's bottom to still carry them -> walking up a ramp
+    MAX_STEP = 16
+
+    def __init__(self, obstacles, lines=(), moving=(), pixel_collision=False):
         self.obstacles = obstacles
+        self.lines = lines
+        self.moving = moving
+
+        # collide by the obstacles' pixel masks instead of their shapes, see `pixel_sweep`
+        self.pixel_collision = pixel_collision
+
+    @property
+    def obstacles(self):
+        return self._obstacles
+
+    @obstacles.setter
+    def obstacles(self, obstacles):
+        """
+        Assigning a new list of obstacles rebuilds the spatial index.
+
+        Obstacles are static - the list should not be modified in place, see `update_obstacles`.
+        """
+        self.set_obstacles(obstacles)
+
+    def set_obstacles(self, obstacles, index=None):
+        """
+        see `obstacles`. A prebuilt spatial `index` of the obstacles (e.g. from a `LevelCache`) is used as it is.
+        """
+        self._obstacles = obstacles
+        self.index = index or SpatialHash.build(
+            obstacles,
+            key=lambda obstacle: obstacle.rect,
+            cell_size=self.CELL_SIZE)
+
+    @property
+    def lines(self):
+        return self._lines
+
+    @lines.setter
+    def lines(self, lines):
+        """
+        Line obstacles (`LineObstacle`) are kept apart from the others, in a segment index
+        """
+        self._lines = list(lines)
+        self.segments = SegmentIndex(self._lines, key=LineObstacle.x_range)
+
+    @property
+    def moving(self):
+        return self._moving
+
+    @moving.setter
+    def moving(self, moving):
+        """
+        Moving obstacles (`MovingObstacle`) are kept in a dynamic AABB tree, see `update_moving`
+        """
+        self._moving = list(moving)
+        self.tree = AABBTree()
+        for obstacle in self._moving:
+            self.tree.insert(obstacle, obstacle.rect)
+
+    def update_moving(self, riders=()):
+        """
+        Moves the moving obstacles by one tick. The `riders` (e.g. the player) standing on top
+        of an obstacle are carried along with it.
+
+        An obstacle's node in the tree is only updated when the obstacle leaves its fat box.
+        """
+        for obstacle in self._moving:
+            carried = [rider for rider in riders if self.is_riding(rider, obstacle)]
+            displacement = obstacle.update()
+            self.tree.move(obstacle, obstacle.rect, displacement)
+
+            for rider in carried:
+                rider.rect.shift(displacement)
+
+    @staticmethod
+    def is_riding(rider, obstacle):
+        rect = rider.rect
+        return rect.bottom == obstacle.rect.top \
+            and rect.left < obstacle.rect.right and rect.right > obstacle.rect.left
 
-    def obstacles_under(self, player):
+    def update_obstacles(self, added=(), removed=()):
+        """
+        Adds / removes obstacles (e.g. streamed level chunks) without rebuilding the spatial index.
+        Line obstacles are sorted out into `lines`, moving obstacles into the AABB tree.
+        """
+        for obstacle in removed:
+            if isinstance(obstacle, MovingObstacle):
+                self._moving.remove(obstacle)
+                self.tree.remove(obstacle)
+        for obstacle in added:
+            if isinstance(obstacle, MovingObstacle):
+                self._moving.append(obstacle)
+                self.tree.insert(obstacle, obstacle.rect)
+
+        added = [obstacle for obstacle in added if not isinstance(obstacle, MovingObstacle)]
+        removed = [obstacle for obstacle in removed if not isinstance(obstacle, MovingObstacle)]
+
+        added_lines = [obstacle for obstacle in added if isinstance(obstacle, LineObstacle)]
+        removed_lines = [obstacle for obstacle in removed if isinstance(obstacle, LineObstacle)]
+        if added_lines or removed_lines:
+            removed_ids = {id(line) for line in removed_lines}
+            self.lines = [line for line in self._lines if id(line) not in removed_ids] + added_lines
+
+        added = [obstacle for obstacle in added if not isinstance(obstacle, LineObstacle)]
+        removed = [obstacle for obstacle in removed if not isinstance(obstacle, LineObstacle)]
+
+        removed_ids = {id(obstacle) for obstacle in removed}
+        for obstacle in removed:
+            self.index.remove(obstacle)
+
+        for obstacle in added:
+            self.index.insert(obstacle, obstacle.rect)
+
+        self._obstacles = [
+            obstacle
+            for obstacle in self._obstacles
+            if id(obstacle) not in removed_ids] + list(added)
+
+    def candidates_under(self, player):
+        """
+        Obstacles sharing a grid column with the player, from the player's bottom downwards,
+        and the moving obstacles in the same area
+        """
+        rect = player.rect
+        return self.index.query(
+            self.index.cell_range(rect.left, rect.right),
+            (self.index.cell(rect.bottom), self.index.rows[1])) + self.moving_under(player)
+
+    def candidates_right(self, player):
+        """
+        Obstacles sharing a grid row with the player, from the player's left side rightwards,
+        and the moving obstacles in the same area
+        """
+        rect = player.rect
+        return self.index.query(
+            (self.index.cell(rect.left), self.index.columns[1]),
+            self.index.cell_range(rect.top, rect.bottom)) + self.moving_right(player)
+
+    def candidates_left(self, player):
+        """
+        see `candidates_right`
+        """
+        rect = player.rect
+        return self.index.query(
+            (self.index.columns[0], self.index.cell(rect.right)),
+            self.index.cell_range(rect.top, rect.bottom)) + self.moving_left(player)
+
+    # `moving_*`: the moving obstacles the `candidates_*` search areas find in the AABB tree
+
+    def moving_under(self, player):
+        rect = player.rect
+        return self.tree.query(rect.left, rect.bottom, rect.right, self.MAX_POSITION)
+
+    def moving_right(self, player):
+        rect = player.rect
+        return self.tree.query(rect.left, rect.top, self.MAX_POSITION, rect.bottom)
+
+    def moving_left(self, player):
+        rect = player.rect
+        return self.tree.query(self.MIN_POSITION, rect.top, rect.right, rect.bottom)
+
+    def obstacles_under(self, player, candidates=None):
         """
         All the obstacles currently positioned under the player
         """
+        if candidates is None:
+            candidates = self.candidates_under(player)
+        profiler.count("collision_tests", len(candidates))
+
         ans = [
             obstacle
-            for obstacle in self.obstacles
+            for obstacle in candidates
             if obstacle.is_under(player.rect)]
         return ans
 
 
-    def obstacles_right(self, player):
+    def obstacles_right(self, player, candidates=None):
         """
         All the obstacles the player collides with to his right hand side
         """
+        if candidates is None:
+            candidates = self.candidates_right(player)
+        profiler.count("collision_tests", len(candidates))
+
         ans = [
             obstacle
-            for obstacle in self.obstacles
+            for obstacle in candidates
             if obstacle.is_to_the_right(player.rect)]  # the player's right border is the obstacle's left -> check obstacle's left collision
         return ans
 
 
-    def obstacles_left(self, player):
+    def obstacles_left(self, player, candidates=None):
         """
         All the obstacles the player collides with to his left hand side
         """
+        if candidates is None:
+            candidates = self.candidates_left(player)
+        profiler.count("collision_tests", len(candidates))
+
         ans = [
             obstacle
-            for obstacle in self.obstacles
+            for obstacle in candidates
             if obstacle.is_to_the_left(player.rect)]  # see `obstacles_right`
         return ans
 
+    def sweep(self, player, displacement):
+        """
+        Moves the player's box along the whole `displacement` (dx, dy) and returns the `Contact` with
+        the first obstacle in the way, None if there is none.
+
+        Like `limit_*`: moving sideways, the player is kept 1 pixel away from the obstacles' sides, and an
+        obstacle whose top or bottom they merely touch is in the way. Moving down, they land right on the
+        obstacles' tops. Obstacles are passed through from below, and ones the player already overlaps are ignored.
+
+        With `pixel_collision`, a move along one axis is checked by the pixels, see `pixel_sweep`.
+        """
+        rect = player.rect
+        dx, dy = displacement
+        if self.pixel_collision and not (dx and dy):
+            return self.pixel_sweep(player, displacement)
+
+        # obstacles' boxes are grown by the margins, see above
+        margin_x = 1 if dx else 0
+        margin_y = 0 if dy else 1
+
+        # everything the box touches on its way
+        left, right = rect.left + min(dx, 0) - margin_x, rect.right + max(dx, 0) + margin_x
+        top, bottom = rect.top + min(dy, 0) - margin_y, rect.bottom + max(dy, 0) + margin_y
+        candidates = self.index.query(
+            self.index.cell_range(left, right),
+            self.index.cell_range(top, bottom)) + self.tree.query(left, top, right, bottom)
+        profiler.count("collision_tests", len(candidates))
+
+        contact = None
+        for obstacle in candidates:
+            box = obstacle.rect
+            hit = sweep_box(
+                rect, (box.left - margin_x, box.top - margin_y, box.right + margin_x, box.bottom + margin_y), dx, dy)
+            if hit is None:
+                continue
+
+            time, normal = hit
+            if normal == (0, 1):
+                continue
+
+            if contact is None or time < contact.time:
+                contact = Contact(time, normal, obstacle)
+
+        return contact
+
+    def sunk_limit(self, player):
+        """
+        Distance (negative) from the player's bottom up to the top of the obstacles they are sunk into - ones
+        whose top is above their feet and bottom below them, e.g. after jumping into one from below.
+        `sweep` ignores these, `MAX_POSITION` if there are none.
+        """
+        rect = player.rect
+        candidates = self.index.query(
+            self.index.cell_range(rect.left, rect.right),
+            self.index.cell_range(rect.top, rect.bottom)) + self.tree.query(rect.left, rect.top, rect.right, rect.bottom)
+        profiler.count("collision_tests", len(candidates))
+
+        if self.pixel_collision:
+            return min([distance for distance in self.pixel_distances(candidates, Obstacle.pixel_distance_under, player, 0)
+                        if distance < 0] + [self.MAX_POSITION])
+
+        return min(
+            [obstacle.rect.top - rect.bottom
+             for obstacle in candidates
+             if obstacle.is_under(rect) and obstacle.rect.top < rect.bottom]
+            + [self.MAX_POSITION])
+
+    def pixel_sweep(self, player, displacement):
+        """
+        `sweep` along one axis by the opaque pixels of the player's and the obstacles' images
+        (`Obstacle.pixel_distance_*`). Pixels never overlap - the player stops 1 pixel before an obstacle,
+        also on its top. The contact's normal is the side of the obstacle's box facing the player.
+        """
+        rect = player.rect
+        dx, dy = displacement
+        if dy < 0 or not (dx or dy):
+            return None
+
+        if dy:
+            distance, length, normal = Obstacle.pixel_distance_under, dy, (0, -1)
+        elif dx > 0:
+            distance, length, normal = Obstacle.pixel_distance_right, dx, (-1, 0)
+        else:
+            distance, length, normal = Obstacle.pixel_distance_left, -dx, (1, 0)
+
+        # everything within the move, and 1 pixel further
+        left, right = rect.left + min(dx, 0) - 1, rect.right + max(dx, 0) + 1
+        top, bottom = rect.top, rect.bottom + dy + 1
+        candidates = self.index.query(
+            self.index.cell_range(left, right),
+            self.index.cell_range(top, bottom)) + self.tree.query(left, top, right, bottom)
+        profiler.count("collision_tests", len(candidates))
+
+        contact = None
+        for obstacle in candidates:
+            travelled = distance(obstacle, player, length)
+            if travelled is None or travelled < 0 or travelled > length:
+                continue
+
+            if contact is None or travelled / length < contact.time:
+                contact = Contact(travelled / length, normal, obstacle)
+
+        return contact
+
+    def ray_cast(self, start, end):
+        """
+        (fraction of the way from `start` to `end` (x, y), obstacle) of the first obstacle the segment
+        hits by its bounding box, None if it hits none
+        """
+        left, right = sorted((start[0], end[0]))
+        top, bottom = sorted((start[1], end[1]))
+        candidates = self.index.query(self.index.cell_range(left, right), self.index.cell_range(top, bottom))
+        candidates += [obstacle for _, obstacle in self.tree.ray_cast(start, end)]
+        profiler.count("collision_tests", len(candidates))
+
+        hit = None
+        for obstacle in candidates:
+            box = obstacle.rect
+            fraction = ray_box(start, end, (box.left, box.top, box.right, box.bottom))
+            if fraction is not None and (hit is None or fraction < hit[0]):
+                hit = (fraction, obstacle)
+
+        return hit
+
+    def ramp_limit(self, player):
+        """
+        Distance from the player's bottom down to the closest line under their feet. Negative if it is
+        at most `MAX_STEP` pixels above them - the player is lifted onto it.
+        """
+        return min(
+            [distance for _, distance in self.lines_under(player)]
+            + [self.MAX_POSITION])
+
+    def lines_under(self, player):
+        """
+        (line, distance from the player's bottom down to the line) of the lines under the player's feet
+        """
+        rect = player.rect
+        candidates = self.segments.query(rect.left, rect.right)
+        profiler.count("collision_tests", len(candidates))
+
+        found = []
+        for line in candidates:
+            top = line.edge.top_between(rect.left, rect.right)
+            if top is not None and top - rect.bottom >= -self.MAX_STEP:
+                found.append((line, top - rect.bottom))
+        return found
+
     def limit_under(self, player):
+        """
+        Distance to the closest surface under the player. Negative if the player stands
+        in a ramp going up, which lifts him onto it.
+        """
+        lines_limit = min([distance for _, distance in self.lines_under(player)] + [self.MAX_POSITION])
+
+        return min(lines_limit, self.reference_limit_under(player))
+
+    def limit_right(self, player):
+        return self.reference_limit_right(player)
+
+    def limit_left(self, player):
+        return self.reference_limit_left(player)
+
+    # `reference_limit_*`: obstacle by obstacle versions of `limit_*`, which work for any shape,
+    # among `candidates` (all obstacles around the player by default).
+
+    def reference_limit_under(self, player, candidates=None):
         distances = [
             player.rect.distance_y(obstacle.rect)  # FIXME: there should be a `-1` here, but it causes the player to unexpectedly stop in some cases
-            for obstacle in self.obstacles_under(player)]
-        
+            for obstacle in self.obstacles_under(player, candidates)]
+
         return min(distances + [self.MAX_POSITION])
 
-    def limit_right(self, player):
+    def reference_limit_right(self, player, candidates=None):
         # `player` should never overlap with the gameboard -> limit the movement 1 pixel before the border
         distances = [
             player.rect.distance_x(obstacle.rect) - 1
-            for obstacle in self.obstacles_right(player)]
-        
+            for obstacle in self.obstacles_right(player, candidates)]
+
         return min(distances + [self.MAX_POSITION])
 
-    def limit_left(self, player):
+    def reference_limit_left(self, player, candidates=None):
         distances = [
             player.rect.distance_x(obstacle.rect) + 1
-            for obstacle in self.obstacles_left(player)]
+            for obstacle in self.obstacles_left(player, candidates)]
 
         return max(distances + [self.MIN_POSITION])
+
+    @staticmethod
+    def pixel_distances(candidates, distance, player, reach=None):
+        profiler.count("collision_tests", len(candidates))
+        distances = [distance(obstacle, player, reach) for obstacle in candidates]
+        return [value for value in distances if value is not None]
+
+
+def sweep_box(rect, box, dx, dy):
+    """
+    Swept AABB test of `rect` moving by (dx, dy) against the static `box` (left, top, right, bottom).
+
+    Returns (time of impact <0, 1>, normal of the hit side), None if they don't meet during the move
+    or already overlap. Touching boxes don't overlap.
+    """
+    left, top, right, bottom = box
+
+    entry_x, exit_x = _axis_times(rect.left, rect.right, left, right, dx)
+    entry_y, exit_y = _axis_times(rect.top, rect.bottom, top, bottom, dy)
+
+    entry = max(entry_x, entry_y)
+    exit = min(exit_x, exit_y)
+    if entry >= exit or entry < 0 or entry > 1:
+        return None
+
+    if entry_x > entry_y:
+        return entry, (-1 if dx > 0 else 1, 0)
+
+    return entry, (0, -1 if dy > 0 else 1)
+
+
+def _axis_times(low, high, box_low, box_high, delta):
+    """
+    The <entry, exit> time interval during which <low, high> moving by `delta` overlaps <box_low, box_high>
+    """
+    if delta > 0:
+        return (box_low - high) / delta, (box_high - low) / delta
+
+    if delta < 0:
+        return (box_high - low) / delta, (box_low - high) / delta
+
+    # not moving on this axis -> overlapping all the time, or never
+    if low < box_high and high > box_low:
+        return -inf, inf
+
+    return inf, -inf
+
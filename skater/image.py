@@ -1,8 +1,11 @@
 import random
+import weakref
 
 import numpy as np
 import pygame
 
+from .cache import LRUCache
+from .pixel_mask import PixelMask
 from .rendering.point import Point
 from .rendering import shape
 
@@ -16,6 +19,12 @@ class Image:
     `self.shape` is a pygame.rect instance for now.
     Will be replaced by another class once non-rectangular shapes are supported
     """
+    # decoded surfaces shared between all `load` calls, keyed by file path
+    surface_cache = LRUCache(capacity=32)
+
+    # surface -> its `PixelMask`; images sharing a surface (see `load`) share the mask
+    mask_cache = weakref.WeakKeyDictionary()
+
     def __init__(self, raw_image, shape):
         self.raw_image = raw_image
         self.shape = shape
@@ -24,9 +33,13 @@ class Image:
     def load(cls, path):
         """
         Loads and prepares an image from a local file
+
+        The decoded surface is cached and shared between calls - it must not be drawn onto.
+        The shape is built anew on every call, so it can be moved freely.
         """
-        raw_image = pygame.image.load(path)
-        raw_image.convert_alpha()
+        raw_image = cls.surface_cache.get(
+            path,
+            lambda: cls.decode(path))
 
         pyrect = raw_image.get_rect()
 
@@ -39,10 +52,40 @@ class Image:
             raw_image,
             rectangle)
 
+    def pixel_mask(self):
+        """
+        The `PixelMask` of the image's opaque pixels, built on first use and cached
+        """
+        if self.raw_image not in self.mask_cache:
+            self.mask_cache[self.raw_image] = PixelMask(self.raw_image)
+
+        return self.mask_cache[self.raw_image]
+
+    @staticmethod
+    def decode(path):
+        """
+        Reads an image file and converts it to the display's pixel format
+
+        Without a display (e.g. a headless simulation) the image is left as it is
+        """
+        return Image.convert(pygame.image.load(path))
+
+    @staticmethod
+    def convert(raw_image):
+        """
+        see `decode`
+        """
+        if pygame.display.get_surface() is None:
+            return raw_image
+
+        return raw_image.convert_alpha()
+
     @classmethod
     def create(cls, size, color=None):
         """
         Creates a new rectangular surface
+
+        The surface only covers the shape's bounding box (see `Polygon.build_surface_mask`)
         """
         # If no color was specified, just create a random one
         color = color or cls.random_color()
@@ -76,6 +119,30 @@ class Image:
         
         return Image(surface, rectangle)
 
+    @classmethod
+    def create_line(cls, start, end, color=None, width=3):
+        """
+        Creates a surface with a line from `start` to `end` (relative to the top left corner of their
+        bounding box), padded by `width` on each side so that the line's thickness isn't clipped
+        """
+        color = color or cls.random_color()
+
+        left, top = min(start.x, end.x), min(start.y, end.y)
+        size = (abs(end.x - start.x) + 2 * width, abs(end.y - start.y) + 2 * width)
+
+        # same size convention as `create`: the shape's bottom right corner is the last pixel
+        surface = pygame.Surface((size[0] + 1, size[1] + 1), flags=pygame.SRCALPHA)
+        pygame.draw.line(
+            surface,
+            color,
+            (start.x - left + width, start.y - top + width),
+            (end.x - left + width, end.y - top + width),
+            width)
+
+        rectangle = shape.rectangle(Point(0, 0), Point(*size))
+
+        return Image(surface, rectangle)
+
     @staticmethod
     def random_color():
         # colors are integers of value <0, 255>
@@ -0,0 +1,55 @@
+import time
+
+import pygame
+
+
+class EventBatch:
+    """
+    The events of one frame in the order they were queued, each with the time (seconds)
+    it was taken off the queue. Iterating yields the events.
+    """
+    def __init__(self, events=(), timestamps=None):
+        self.events = list(events)
+        self.timestamps = [0] * len(self.events) if timestamps is None else list(timestamps)
+
+    def __iter__(self):
+        return iter(self.events)
+
+    def __len__(self):
+        return len(self.events)
+
+    def __repr__(self):
+        return "EventBatch: {}".format(self.events)
+
+    def timed(self):
+        """
+        (timestamp, event) pairs, oldest first
+        """
+        return zip(self.timestamps, self.events)
+
+    def extend(self, other):
+        self.events.extend(other.events)
+        self.timestamps.extend(other.timestamps)
+
+    def key_pressed(self, keys):
+        """
+        True if a key down event of any of `keys` is in the batch
+        """
+        return any(event.type == pygame.KEYDOWN and event.key in keys for event in self.events)
+
+
+class InputDispatcher:
+    """
+    Drains the whole pygame event queue once per frame, so that events arriving together
+    (e.g. a key pressed and released within a frame) are all handled in that frame, in order.
+
+    pygame doesn't expose SDL's event timestamps - events are stamped with `clock()`
+    at the moment they are taken off the queue.
+    """
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+
+    def poll(self):
+        events = pygame.event.get()
+        now = self.clock()
+        return EventBatch(events, [now] * len(events))
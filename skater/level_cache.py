@@ -0,0 +1,245 @@
+"""
+Precompiled levels: obstacle geometry, the spatial index and the obstacles' pixels in one binary file.
+
+Loading memory-maps the file - the surfaces are built on top of the mapped pixels without
+copying them, and no rasterization happens. The cache remembers a hash of the level definition
+it was compiled from and is recompiled when the definition changes.
+
+File layout:
+    b"SKATER-LEVEL-CACHE\n"
+    header - one line of JSON: {"version", "source", "cell_size", "arrays": {name: [dtype, shape, offset]}}
+    array data, starting at the first multiple of `ALIGNMENT` after the header
+
+Array offsets count from the start of the array data, each one is aligned to `ALIGNMENT` bytes.
+"""
+import hashlib
+import json
+import mmap
+import os
+import tempfile
+
+import numpy as np
+import pygame
+
+from .gameboard import GameBoard
+from .image import Image
+from .obstacles import LINE, LineObstacle, MOVING, MovingObstacle, Obstacle, PLATFORM
+from .rendering.point import Point
+from .rendering.shape import Polygon, Rectangle, rectangle
+from .spatial_hash import SpatialHash
+
+
+def user_cache_directory():
+    """
+    Where the game keeps its caches: $XDG_CACHE_HOME/skater, ~/.cache/skater by default
+    """
+    return os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"), "skater")
+
+
+# `OBSTACLES` compiled - outside of the package, which may be installed read-only
+OBSTACLES_CACHE_PATH = os.path.join(user_cache_directory(), "obstacles_list.levelcache")
+
+
+class LevelCache:
+    MAGIC = b"SKATER-LEVEL-CACHE\n"
+    VERSION = 3
+    ALIGNMENT = 64
+
+    # kinds of the stored obstacles
+    POLYGON = 0
+    RECTANGLE = 1
+    LINE = 2
+    MOVING = 3
+
+    def __init__(self, obstacles, index, lines=(), moving=()):
+        self.obstacles = obstacles
+        self.index = index
+        self.lines = list(lines)
+        self.moving = list(moving)
+
+    @classmethod
+    def load_or_compile(cls, definitions, path, cell_size=GameBoard.CELL_SIZE):
+        """
+        The level described by {name: definition} (like `OBSTACLES`), read from the cache at `path`.
+
+        The cache is (re)written if it is missing, outdated or unreadable. A cache which can't be
+        written (e.g. a read-only install) is skipped - the freshly compiled level is returned.
+        """
+        source = cls.source_hash(definitions, cell_size)
+
+        try:
+            return cls.load(path, source)
+        except (OSError, ValueError, KeyError):
+            pass
+
+        obstacles = [
+            Obstacle.from_definition(definition)
+            for definition in definitions.values() if definition['type'] == PLATFORM]
+        lines = [
+            LineObstacle.from_definition(definition)
+            for definition in definitions.values() if definition['type'] == LINE]
+        moving = [
+            MovingObstacle.from_definition(definition)
+            for definition in definitions.values() if definition['type'] == MOVING]
+        index = SpatialHash.build(obstacles, key=lambda obstacle: obstacle.rect, cell_size=cell_size)
+
+        level = cls(obstacles, index, lines, moving)
+        try:
+            level.write(path, source)
+        except OSError:
+            pass
+
+        return level
+
+    @classmethod
+    def source_hash(cls, definitions, cell_size):
+        source = json.dumps([cls.VERSION, cell_size, definitions], sort_keys=True)
+        return hashlib.sha256(source.encode()).hexdigest()
+
+    def kind(self, obstacle):
+        if isinstance(obstacle, LineObstacle):
+            return self.LINE
+
+        if isinstance(obstacle, MovingObstacle):
+            return self.MOVING
+
+        return self.RECTANGLE if isinstance(obstacle.rect, Rectangle) else self.POLYGON
+
+    def geometry(self, obstacle):
+        """
+        The points stored for an obstacle: a line's ends, a moving obstacle's rectangle at its start
+        and its end position, the vertices of other shapes
+        """
+        if isinstance(obstacle, LineObstacle):
+            return np.array([(point.x, point.y) for point in obstacle.edge.vertices()])
+
+        if isinstance(obstacle, MovingObstacle):
+            start = obstacle.rect.points - (obstacle.rect.x - obstacle.start.x, obstacle.rect.y - obstacle.start.y)
+            return np.concatenate([start, [(obstacle.end.x, obstacle.end.y)]])
+
+        return obstacle.rect.points
+
+    def write(self, path, source):
+        # the platforms first - the spatial index refers to them by their position
+        obstacles = self.obstacles + self.lines + self.moving
+        surfaces = [obstacle.image.raw_image for obstacle in obstacles]
+
+        # geometry: the points of all obstacles, concatenated
+        geometry = [self.geometry(obstacle) for obstacle in obstacles]
+        points = np.concatenate(geometry) if geometry else np.zeros((0, 2))
+        point_offsets = np.cumsum([0] + [len(obstacle_points) for obstacle_points in geometry])
+        kinds = np.array([self.kind(obstacle) for obstacle in obstacles], dtype=np.uint8)
+        speeds = np.array([obstacle.speed for obstacle in self.moving], dtype=np.float64)
+
+        # pixels: RGBA bytes of all surfaces, concatenated
+        pixels = [pygame.image.tobytes(surface, "RGBA") for surface in surfaces]
+        sizes = np.array([surface.get_size() for surface in surfaces], dtype=np.int64).reshape(-1, 2)
+        pixel_offsets = np.cumsum([0] + [len(buffer) for buffer in pixels])
+
+        # spatial index: the items of each cell, concatenated
+        cells = sorted(self.index.cells.items())
+        cell_keys = np.array([cell for cell, _ in cells], dtype=np.int64).reshape(-1, 2)
+        cell_offsets = np.cumsum([0] + [len(items) for _, items in cells])
+        cell_items = np.array([item for _, items in cells for item in items], dtype=np.int64)
+
+        arrays = {
+            "points": points,
+            "point_offsets": point_offsets.astype(np.int64),
+            "kinds": kinds,
+            "speeds": speeds,
+            "sizes": sizes,
+            "pixel_offsets": pixel_offsets.astype(np.int64),
+            "pixels": np.frombuffer(b"".join(pixels), dtype=np.uint8),
+            "cell_keys": cell_keys,
+            "cell_offsets": cell_offsets.astype(np.int64),
+            "cell_items": cell_items,
+        }
+
+        header = {"version": self.VERSION, "source": source, "cell_size": self.index.cell_size, "arrays": {}}
+        data_size = 0
+        for name, array in arrays.items():
+            header["arrays"][name] = [array.dtype.str, list(array.shape), data_size]
+            data_size = self.align(data_size + array.nbytes)
+
+        header_line = json.dumps(header, separators=(",", ":")).encode() + b"\n"
+        data_start = self.align(len(self.MAGIC) + len(header_line))
+
+        # written next to the destination and renamed, so a reader never sees a partial file
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        descriptor, temporary_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        try:
+            with os.fdopen(descriptor, "wb") as output:
+                output.write(self.MAGIC)
+                output.write(header_line)
+                for name, array in arrays.items():
+                    output.seek(data_start + header["arrays"][name][2])
+                    output.write(np.ascontiguousarray(array).tobytes())
+
+                # empty trailing arrays still need their (zero length) place in the file
+                output.truncate(data_start + data_size)
+            os.replace(temporary_path, path)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+
+    @classmethod
+    def align(cls, offset):
+        return -(-offset // cls.ALIGNMENT) * cls.ALIGNMENT
+
+    @classmethod
+    def load(cls, path, source=None):
+        """
+        Raises ValueError if the file isn't a level cache of the current version (compiled from `source`)
+        """
+        with open(path, "rb") as cache_file:
+            if os.fstat(cache_file.fileno()).st_size == 0:
+                raise ValueError("Empty level cache: {}".format(path))
+            buffer = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if buffer[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError("{} is not a level cache".format(path))
+
+        header_end = buffer.find(b"\n", len(cls.MAGIC)) + 1
+        header = json.loads(buffer[len(cls.MAGIC):header_end])
+        data_start = cls.align(header_end)
+        if header["version"] != cls.VERSION or (source is not None and header["source"] != source):
+            raise ValueError("Outdated level cache: {}".format(path))
+
+        arrays = {
+            name: np.frombuffer(buffer, dtype=dtype, count=int(np.prod(shape)), offset=data_start + offset).reshape(shape)
+            for name, (dtype, shape, offset) in header["arrays"].items()}
+
+        obstacles = []
+        lines = []
+        moving = []
+        speeds = arrays["speeds"].tolist()
+        pixels = memoryview(buffer)[data_start + header["arrays"]["pixels"][2]:]
+        point_offsets = arrays["point_offsets"].tolist()
+        pixel_offsets = arrays["pixel_offsets"].tolist()
+        for i, (size, kind) in enumerate(zip(arrays["sizes"].tolist(), arrays["kinds"].tolist())):
+            # geometry is copied - shapes are moved in place. The pixels are used as they are mapped.
+            points = arrays["points"][point_offsets[i]:point_offsets[i + 1]].copy()
+            surface = pygame.image.frombuffer(pixels[pixel_offsets[i]:pixel_offsets[i + 1]], size, "RGBA")
+
+            if kind == cls.LINE:
+                start, end = (Point(x, y) for x, y in points.tolist())
+                shape = rectangle(Point(0, 0), Point(size[0] - 1, size[1] - 1))
+                lines.append(LineObstacle(start, end, Image(surface, shape)))
+            elif kind == cls.MOVING:
+                (end_x, end_y), points = points[-1].tolist(), points[:-1]
+                rect = Rectangle.from_array(points)
+                moving.append(MovingObstacle(
+                    Image(surface, rect), x = rect.x, y = rect.y, end = Point(end_x, end_y), speed = speeds[len(moving)]))
+            else:
+                rect = (Rectangle if kind == cls.RECTANGLE else Polygon).from_array(points)
+                obstacles.append(Obstacle(Image(surface, rect), x = rect.x, y = rect.y))
+
+        cell_offsets = arrays["cell_offsets"].tolist()
+        cell_items = arrays["cell_items"].tolist()
+        cells = {
+            (column, row): cell_items[cell_offsets[i]:cell_offsets[i + 1]]
+            for i, (column, row) in enumerate(arrays["cell_keys"].tolist())}
+        index = SpatialHash.from_cells(obstacles, cells, header["cell_size"])
+
+        return cls(obstacles, index, lines, moving)
@@ -0,0 +1,131 @@
+from math import floor
+
+import pygame
+
+from .cache import LRUCache
+from .dirty_rects import dirty_rects
+from .obstacles import MovingObstacle
+from .profiler import profiler
+from .spatial_hash import SpatialHash
+
+
+class LevelLayer:
+    """
+    Static obstacles pre-rendered into square chunks of the world. Moving obstacles (`MovingObstacle`)
+    are left out - they are drawn one by one.
+
+    A chunk is baked the first time the camera gets close to it and kept in a
+    bounded cache, so drawing the level costs a few chunk blits per frame,
+    regardless of the number of obstacles.
+    """
+    CHUNK_SIZE = 512
+
+    # upper bound of memory used by the baked chunks (32 bit pixels)
+    MAX_BYTES = 64 * 2 ** 20
+
+    # chunks around the viewport baked ahead of time, so that they are ready when the camera gets there
+    MARGIN = 1
+
+    def __init__(self, obstacles, chunk_size=CHUNK_SIZE, max_bytes=MAX_BYTES):
+        self.chunk_size = chunk_size
+
+        # each cell of the index is exactly one chunk
+        self.index = SpatialHash.build(
+            static(obstacles),
+            key=lambda obstacle: obstacle.rect,
+            cell_size=chunk_size)
+
+        chunk_bytes = 4 * chunk_size ** 2
+        self.chunks = LRUCache(capacity=max(1, max_bytes // chunk_bytes))
+
+        # chunks whose content changed since they were last drawn
+        self.changed = set()
+
+    def update_obstacles(self, added=(), removed=()):
+        """
+        Adds / removes obstacles, the chunks they overlap are baked again when needed
+        """
+        for obstacle in static(removed):
+            self.index.remove(obstacle)
+            self.discard_chunks(obstacle.rect)
+
+        for obstacle in static(added):
+            self.index.insert(obstacle, obstacle.rect)
+            self.discard_chunks(obstacle.rect)
+
+    def discard_chunks(self, rect):
+        first_column, last_column = self.index.cell_range(rect.left, rect.right)
+        first_row, last_row = self.index.cell_range(rect.top, rect.bottom)
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                self.chunks.discard((column, row))
+                self.changed.add((column, row))
+
+    def chunk(self, column, row):
+        """
+        The baked surface of a chunk, None if there is nothing to draw in it
+        """
+        return self.chunks.get(
+            (column, row),
+            lambda: self.bake(column, row))
+
+    def bake(self, column, row):
+        obstacles = self.index.query((column, column), (row, row))
+        if not obstacles:
+            return None
+
+        surface = pygame.Surface(
+            (self.chunk_size, self.chunk_size),
+            flags=pygame.SRCALPHA)
+
+        # obstacles are drawn in the level's order, parts outside of the chunk are clipped
+        origin_x = column * self.chunk_size
+        origin_y = row * self.chunk_size
+        for obstacle in obstacles:
+            surface.blit(
+                obstacle.image.raw_image,
+                (obstacle.rect.x - origin_x, obstacle.rect.y - origin_y))
+
+        return surface
+
+    def visible_chunks(self, viewport, margin=0):
+        """
+        (column, row) of the chunks overlapping the viewport, extended by `margin` chunks on each side
+        """
+        first_column, last_column = self.index.cell_range(viewport.left, viewport.right)
+        first_row, last_row = self.index.cell_range(viewport.top, viewport.bottom)
+
+        return [
+            (column, row)
+            for column in range(first_column - margin, last_column + margin + 1)
+            for row in range(first_row - margin, last_row + margin + 1)]
+
+    def draw(self, screen, camera):
+        viewport = camera.viewport(screen.get_rect())
+
+        # bake the chunks the camera is approaching
+        for column, row in self.visible_chunks(viewport, self.MARGIN):
+            self.chunk(column, row)
+
+        for column, row in self.visible_chunks(viewport):
+            rendering_position = (
+                floor(column * self.chunk_size - camera.x),
+                floor(row * self.chunk_size - camera.y))
+
+            # the chunks are redrawn identically every frame -> only a changed one has to be pushed to the window.
+            # A moving camera updates the whole window anyway.
+            if (column, row) in self.changed:
+                dirty_rects.add(screen.get_rect().clip(rendering_position, (self.chunk_size, self.chunk_size)))
+
+            surface = self.chunk(column, row)
+            if surface is None:
+                continue
+
+            screen.blit(surface, rendering_position)
+            profiler.count("blits")
+
+        self.changed.clear()
+
+
+def static(obstacles):
+    return [obstacle for obstacle in obstacles if not isinstance(obstacle, MovingObstacle)]
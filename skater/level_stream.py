@@ -0,0 +1,217 @@
+"""
+Chunked level files, streamed in and out around the camera.
+
+File layout:
+    b"SKATER-LEVEL\n"
+    header - one line of JSON: {"version", "chunk_size", "chunks": [[column, row, offset, length], ...]}
+    chunk payloads - each a JSON object {name: definition}, `offset` counts from the end of the header
+
+An obstacle is stored in every chunk its bounding box overlaps, so that any loaded chunk
+knows about everything inside it.
+
+    python -m skater.level_stream level.skl     # writes `OBSTACLES` into a level file
+"""
+import json
+import sys
+
+from .obstacles import LINE, MOVING, Obstacle, PLATFORM, from_definition
+from .spatial_hash import SpatialHash
+
+
+class LevelFile:
+    MAGIC = b"SKATER-LEVEL\n"
+    VERSION = 1
+    CHUNK_SIZE = 1024
+
+    def __init__(self, path):
+        """
+        Reads the header only - chunks are read on demand by `read_chunk`
+        """
+        self.file = open(path, "rb")
+
+        if self.file.readline() != self.MAGIC:
+            self.file.close()
+            raise ValueError("{} is not a level file".format(path))
+
+        header = json.loads(self.file.readline())
+        if header["version"] != self.VERSION:
+            self.file.close()
+            raise ValueError("Unsupported level file version: {}".format(header["version"]))
+
+        self.chunk_size = header["chunk_size"]
+        self.data_start = self.file.tell()
+
+        # (column, row) -> (offset, length); empty chunks are not stored
+        self.chunks = {
+            (column, row): (offset, length)
+            for column, row, offset, length in header["chunks"]}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.file.close()
+
+    def read_chunk(self, column, row):
+        """
+        {name: definition} of the obstacles overlapping the chunk
+        """
+        if (column, row) not in self.chunks:
+            return {}
+
+        offset, length = self.chunks[column, row]
+        self.file.seek(self.data_start + offset)
+        return json.loads(self.file.read(length))
+
+    @classmethod
+    def write(cls, path, definitions, chunk_size=CHUNK_SIZE):
+        """
+        Splits {name: definition} (like `OBSTACLES`) into chunks of `chunk_size` pixels and saves them to `path`
+        """
+        grid = SpatialHash(chunk_size)
+        chunks = {}
+        for name, definition in definitions.items():
+            left, top, right, bottom = Obstacle.definition_bounds(definition)
+            for column in range(grid.cell(left), grid.cell(right) + 1):
+                for row in range(grid.cell(top), grid.cell(bottom) + 1):
+                    chunks.setdefault((column, row), {})[name] = definition
+
+        index = []
+        payloads = []
+        offset = 0
+        for (column, row), chunk in sorted(chunks.items()):
+            payload = json.dumps(chunk, separators=(",", ":")).encode()
+            index.append([column, row, offset, len(payload)])
+            payloads.append(payload)
+            offset += len(payload)
+
+        header = {"version": cls.VERSION, "chunk_size": chunk_size, "chunks": index}
+        with open(path, "wb") as output:
+            output.write(cls.MAGIC)
+            output.write(json.dumps(header, separators=(",", ":")).encode() + b"\n")
+            output.writelines(payloads)
+
+
+class LevelStreamer:
+    """
+    Keeps the obstacles of the chunks around the camera loaded.
+
+    Chunks within `MARGIN` of the viewport, and `LOOKAHEAD` further in the direction the
+    camera is travelling, are loaded. Chunks farther than `KEEP` from the viewport are evicted.
+    The number of loaded chunks - and the memory used - therefore only depends on the size of
+    the screen, not of the level.
+    """
+    MARGIN = 1
+    LOOKAHEAD = 2
+
+    # > MARGIN + LOOKAHEAD, so that a camera moving back and forth doesn't reload the same chunks
+    KEEP = 4
+
+    def __init__(self, level_file):
+        self.level_file = level_file
+        self.grid = SpatialHash(level_file.chunk_size)
+
+        # (column, row) -> names of the chunk's obstacles
+        self.loaded = {}
+
+        # name -> obstacle, and the number of loaded chunks containing it
+        self.obstacles = {}
+        self.references = {}
+
+        self.last_centre = None
+
+    def chunk_ranges(self, viewport):
+        """
+        Inclusive column and row ranges of the chunks overlapping the viewport
+        """
+        return (self.grid.cell_range(viewport.left, viewport.right),
+                self.grid.cell_range(viewport.top, viewport.bottom))
+
+    def wanted_chunks(self, viewport, direction):
+        (first_column, last_column), (first_row, last_row) = self.chunk_ranges(viewport)
+        direction_x, direction_y = direction
+
+        # extend the margin on the side the camera is moving towards
+        first_column -= self.MARGIN + (self.LOOKAHEAD if direction_x < 0 else 0)
+        last_column += self.MARGIN + (self.LOOKAHEAD if direction_x > 0 else 0)
+        first_row -= self.MARGIN + (self.LOOKAHEAD if direction_y < 0 else 0)
+        last_row += self.MARGIN + (self.LOOKAHEAD if direction_y > 0 else 0)
+
+        return [
+            (column, row)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)
+            if (column, row) in self.level_file.chunks]
+
+    def is_kept(self, chunk, viewport):
+        (first_column, last_column), (first_row, last_row) = self.chunk_ranges(viewport)
+        column, row = chunk
+        return first_column - self.KEEP <= column <= last_column + self.KEEP \
+            and first_row - self.KEEP <= row <= last_row + self.KEEP
+
+    def update(self, viewport):
+        """
+        Loads / evicts chunks for the current camera viewport. Returns the (added, removed) obstacles.
+        """
+        centre = ((viewport.left + viewport.right) / 2, (viewport.top + viewport.bottom) / 2)
+        if self.last_centre is None:
+            direction = (0, 0)
+        else:
+            direction = (sign(centre[0] - self.last_centre[0]), sign(centre[1] - self.last_centre[1]))
+        self.last_centre = centre
+
+        added = []
+        for chunk in self.wanted_chunks(viewport, direction):
+            if chunk not in self.loaded:
+                added.extend(self.load(chunk))
+
+        removed = []
+        for chunk in [chunk for chunk in self.loaded if not self.is_kept(chunk, viewport)]:
+            removed.extend(self.evict(chunk))
+
+        return added, removed
+
+    def load(self, chunk):
+        """
+        Reads a chunk, returns the obstacles not loaded by any other chunk yet
+        """
+        definitions = {
+            name: definition
+            for name, definition in self.level_file.read_chunk(*chunk).items()
+            if definition['type'] in (PLATFORM, LINE, MOVING)}
+        self.loaded[chunk] = list(definitions)
+
+        added = []
+        for name, definition in definitions.items():
+            if name not in self.obstacles:
+                self.obstacles[name] = from_definition(definition)
+                self.references[name] = 0
+                added.append(self.obstacles[name])
+            self.references[name] += 1
+
+        return added
+
+    def evict(self, chunk):
+        """
+        Forgets a chunk, returns the obstacles no other loaded chunk contains
+        """
+        removed = []
+        for name in self.loaded.pop(chunk):
+            self.references[name] -= 1
+            if self.references[name] == 0:
+                del self.references[name]
+                removed.append(self.obstacles.pop(name))
+
+        return removed
+
+
+def sign(value):
+    return (value > 0) - (value < 0)
+
+
+if __name__ == "__main__":
+    from .obstacles_list import OBSTACLES
+    LevelFile.write(sys.argv[1], OBSTACLES)
@@ -1,5 +1,6 @@
 from .state import *
 from .destination import Destination
+from .preloader import preloader
 
 
 class Menu(State):
@@ -31,25 +32,26 @@ class Menu(State):
             elif self.active_state == "Exit": return Destination.EXIT
 
     
-    def run(self, screen, event): 
+    def run(self, screen, events): 
         
-        if event.type == pygame.KEYDOWN:
+        for event in events:
+            if event.type == pygame.KEYDOWN:
 
-            if event.key in CONTROLS["M_DOWN"] and self.selected_index < (len(self.OPTIONS) - 1):
-                self.selected_index = self._next_index()
+                if event.key in CONTROLS["M_DOWN"] and self.selected_index < (len(self.OPTIONS) - 1):
+                    self.selected_index = self._next_index()
 
-            if event.key in CONTROLS["M_UP"] and self.selected_index > 0:
-                self.selected_index = self._previous_index()
+                if event.key in CONTROLS["M_UP"] and self.selected_index > 0:
+                    self.selected_index = self._previous_index()
 
-            if event.key in CONTROLS["M_SELECT"]:
-               #if self.selected_index == 0: self.active_state = "game"
-               #if self.selected_index == 1: self.active_state = "controls"
-               #if self.selected_index == 2: pygame.quit()
-               self.active_state = self.OPTIONS[self.selected_index]
+                if event.key in CONTROLS["M_SELECT"]:
+                   #if self.selected_index == 0: self.active_state = "game"
+                   #if self.selected_index == 1: self.active_state = "controls"
+                   #if self.selected_index == 2: pygame.quit()
+                   self.active_state = self.OPTIONS[self.selected_index]
 
 
     def display_frame(self, screen, background_image):
-        font = pygame.font.SysFont('Arial', 60)
+        font = get_font('Arial', 60)
         BLACK = (0, 0, 0); WHITE = (255, 255, 255); RED = (255, 0, 0)
         selected_marker = ">"; unselected_marker = " "
 
@@ -62,4 +64,8 @@ class Menu(State):
 
             draw_text(screen, text, font, BLACK, "L", 550, 250 + i*100)
 
-        pygame.display.update()
\ No newline at end of file
+        finished, submitted = preloader.progress()
+        if finished < submitted:
+            draw_text(screen, "Loading... {}/{}".format(finished, submitted), get_font('Arial', 20), BLACK, "L", 550, 600)
+
+        dirty_rects.update_display()
\ No newline at end of file
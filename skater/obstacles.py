@@ -1,8 +1,19 @@
-from math import inf
+from math import hypot, inf
 
 import pygame
 from pygame.locals import *
 
+from . import image
+from .image import Image
+from .pixel_mask import DOWN, LEFT, RIGHT, first_contact
+from .rendering.edge import Edge
+from .rendering.point import Point
+
+# obstacle types, see `obstacles_list.py`
+PLATFORM = 1
+LINE = 2
+MOVING = 3
+
 
 class Obstacle(pygame.sprite.Sprite):
 
@@ -12,6 +23,36 @@ class Obstacle(pygame.sprite.Sprite):
         self.rect = self.image.shape
         self.rect.x = x
         self.rect.y = y
+
+    @classmethod
+    def from_definition(cls, definition):
+        """
+        Builds a platform obstacle from its level definition (an `OBSTACLES` value)
+        """
+        return cls(
+            image = image.Image.create( (definition['size']['width'], definition['size']['height']) ),
+            x = definition['position']['x'],
+            y = definition['position']['y'])
+
+    @staticmethod
+    def definition_bounds(definition):
+        """
+        (left, top, right, bottom) of the area covered by an obstacle definition of any type
+        """
+        if definition['type'] == LINE:
+            start, end = definition['start_position'], definition['end_position']
+            return (min(start['x'], end['x']), min(start['y'], end['y']),
+                    max(start['x'], end['x']), max(start['y'], end['y']))
+
+        x, y = definition['position']['x'], definition['position']['y']
+        width, height = definition['size']['width'], definition['size']['height']
+        if definition['type'] == MOVING:
+            # the whole way travelled
+            end = definition['end_position']
+            return (min(x, end['x']), min(y, end['y']),
+                    max(x, end['x']) + width, max(y, end['y']) + height)
+
+        return (x, y, x + width, y + height)
         
     def is_under(self, other_rect):
         """
@@ -43,4 +84,134 @@ class Obstacle(pygame.sprite.Sprite):
         Checks if `self` is located to the left of `other_rect`, regardless of the distance
         """
         distance = other_rect.distance_x(self.rect)
-        return distance != inf and distance < 0
\ No newline at end of file
+        return distance != inf and distance < 0
+
+    # `pixel_distance_*`: how far `other` (anything with an `image` and a `rect`, e.g. the player) can move
+    # towards the obstacle before their opaque pixels touch, None if it doesn't within `reach` pixels (no limit
+    # if None). Negative if they overlap already - the distance to move `other` back by.
+    # The bounding boxes are checked first, only then the (cached) pixel masks.
+
+    def pixel_distance_under(self, other, reach=None):
+        if not self.is_under(other.rect):
+            return None
+
+        return self.pixel_distance(other, DOWN, reach)
+
+    def pixel_distance_right(self, other, reach=None):
+        if not (self.rect.right > other.rect.right and self.overlaps_rows(other.rect)):
+            return None
+
+        return self.pixel_distance(other, RIGHT, reach)
+
+    def pixel_distance_left(self, other, reach=None):
+        """
+        see `pixel_distance_under` - the distance is measured leftwards, so it is negated by `GameBoard`
+        """
+        if not (self.rect.left < other.rect.left and self.overlaps_rows(other.rect)):
+            return None
+
+        return self.pixel_distance(other, LEFT, reach)
+
+    def overlaps_rows(self, other_rect):
+        return self.rect.top < other_rect.bottom and self.rect.bottom > other_rect.top
+
+    def pixel_distance(self, other, direction, reach=None):
+        # a mask's top left pixel is where the image is drawn - at the rect's top left corner
+        contact = first_contact(
+            other.image.pixel_mask(), other.rect.mask_bounds()[:2],
+            self.image.pixel_mask(), self.rect.mask_bounds()[:2],
+            direction,
+            None if reach is None else reach + 1)
+
+        # touching pixels would overlap -> stop one pixel before
+        return None if contact is None else contact - 1
+
+
+class MovingObstacle(Obstacle):
+    """
+    An obstacle (e.g. a moving platform) travelling back and forth between its initial
+    position and `end` (a `Point`), `speed` pixels per tick
+    """
+    def __init__(self, image, x = 0, y = 0, end = None, speed = 1):
+        super().__init__(image, x = x, y = y)
+        self.start = Point(x, y)
+        self.end = end or self.start
+        self.speed = speed
+
+        # exact position - `rect` is moved by whole pixels
+        self.position = Point(x, y)
+        self.target = self.end
+
+    @classmethod
+    def from_definition(cls, definition):
+        """
+        Builds a moving obstacle from its level definition (an `OBSTACLES` value of type `MOVING`)
+        """
+        end = definition['end_position']
+        return cls(
+            image = image.Image.create( (definition['size']['width'], definition['size']['height']) ),
+            x = definition['position']['x'],
+            y = definition['position']['y'],
+            end = Point(end['x'], end['y']),
+            speed = definition.get('speed', 1))
+
+    def update(self):
+        """
+        Moves the obstacle by one tick, returns the (dx, dy) its `rect` moved by
+        """
+        dx, dy = self.target.x - self.position.x, self.target.y - self.position.y
+        distance = hypot(dx, dy)
+        if distance <= self.speed:
+            # reached the target -> turn around
+            self.position = self.target
+            self.target = self.start if self.target is self.end else self.end
+        else:
+            self.position = self.position + (dx * self.speed / distance, dy * self.speed / distance)
+
+        x, y = self.rect.x, self.rect.y
+        self.rect.x = self.position.x
+        self.rect.y = self.position.y
+        return self.rect.x - x, self.rect.y - y
+
+
+class LineObstacle(pygame.sprite.Sprite):
+    """
+    A line / ramp the player rides on. Its collision geometry is the `edge`, `rect` is the
+    bounding box of its image (the line padded by `WIDTH`).
+
+    Lines are surfaces - the player passes through them from below and from the sides.
+    """
+    WIDTH = 3
+
+    def __init__(self, start, end, image=None):
+        super().__init__()
+        self.edge = Edge(start, end)
+        self.image = image or Image.create_line(start, end, width=self.WIDTH)
+        self.rect = self.image.shape
+        self.rect.x = min(start.x, end.x) - self.WIDTH
+        self.rect.y = min(start.y, end.y) - self.WIDTH
+
+    @classmethod
+    def from_definition(cls, definition):
+        """
+        Builds a line obstacle from its level definition (an `OBSTACLES` value of type `LINE`)
+        """
+        start, end = definition['start_position'], definition['end_position']
+        return cls(Point(start['x'], start['y']), Point(end['x'], end['y']))
+
+    def x_range(self):
+        a, b, x_boundaries, y_boundaries = self.edge.get_equation_params()
+        return x_boundaries
+
+
+def from_definition(definition):
+    """
+    The obstacle described by a level definition of any supported type
+    """
+    if definition['type'] == LINE:
+        return LineObstacle.from_definition(definition)
+
+    if definition['type'] == MOVING:
+        return MovingObstacle.from_definition(definition)
+
+    return Obstacle.from_definition(definition)
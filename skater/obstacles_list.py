@@ -2,6 +2,7 @@
     Types description:
     1 - platform / rectangular shape
     2 - line
+    3 - moving platform, travelling from `position` to `end_position` and back, `speed` pixels per tick
 """
 
 OBSTACLES = {
@@ -0,0 +1,105 @@
+import numpy as np
+import pygame
+
+# directions of `first_contact`
+DOWN = (0, 1)
+RIGHT = (1, 0)
+LEFT = (-1, 0)
+
+
+class PixelMask:
+    """
+    A `pygame.mask.Mask` of a surface's opaque pixels, for pixel-accurate collisions.
+
+    Next to the mask, it keeps the outline of the shape: the first / last opaque row of every column,
+    and the first / last opaque column of every row. They tell `first_contact` where two shapes apart
+    meet without testing the masks at all.
+    """
+    def __init__(self, surface):
+        self.mask = pygame.mask.from_surface(surface)
+        self.width, self.height = self.mask.get_size()
+
+        # [x, y] -> True for opaque pixels
+        filled = pygame.surfarray.array_red(self.mask.to_surface()) > 0
+
+        self.columns = filled.any(axis=1)
+        self.tops = filled.argmax(axis=1)
+        self.bottoms = self.height - 1 - filled[:, ::-1].argmax(axis=1)
+
+        self.rows = filled.any(axis=0)
+        self.lefts = filled.argmax(axis=0)
+        self.rights = self.width - 1 - filled[::-1, :].argmax(axis=0)
+
+    def outline(self, vertical, sign):
+        """
+        (lines with any opaque pixel, the opaque pixel furthest in `sign` direction on each line) for
+        columns if `vertical`, rows otherwise
+        """
+        if vertical:
+            return self.columns, self.bottoms if sign > 0 else self.tops
+
+        return self.rows, self.rights if sign > 0 else self.lefts
+
+
+def first_contact(mover, mover_position, target, target_position, direction, reach=None):
+    """
+    The distance `mover` (a `PixelMask` with its top left pixel at `mover_position`) travels in
+    `direction` (`DOWN`, `RIGHT` or `LEFT`) before any of its pixels overlaps one of `target`'s,
+    None if it doesn't within `reach` pixels (e.g. the distance moved in a tick; no limit if None).
+
+    The distance is negative if they overlap already - `mover` would have to come from that far
+    behind to meet `target`.
+    """
+    dx, dy = direction
+    vertical = dy != 0
+    sign = dx + dy
+
+    # "along" is the axis of the movement, "across" the other one
+    axis = 1 if vertical else 0
+    mover_along, target_along = mover_position[axis], target_position[axis]
+    shift = mover_position[1 - axis] - target_position[1 - axis]
+    mover_size = mover.height if vertical else mover.width
+    target_size = target.height if vertical else target.width
+    target_lines = target.width if vertical else target.height
+
+    # bounding box pre-check: the lines (columns / rows) they share
+    first = max(0, shift)
+    last = min(target_lines, shift + (mover.width if vertical else mover.height))
+    if first >= last:
+        return None
+
+    mover_present, mover_front = mover.outline(vertical, sign)
+    target_present, target_back = target.outline(vertical, -sign)
+    present = mover_present[first - shift:last - shift] & target_present[first:last]
+    if not present.any():
+        return None
+
+    # pixels on a shared line first meet when the front of `mover` reaches the back of `target` there
+    # -> the smallest gap is where the shapes meet, unless `mover` is past the back of `target` already
+    gaps = sign * ((target_back[first:last] + target_along) - (mover_front[first - shift:last - shift] + mover_along))
+    start = int(gaps[present].min())
+    if start > 0:
+        return start if reach is None or start <= reach else None
+
+    def overlaps(distance):
+        along = mover_along + sign * distance - target_along
+        offset = (shift, along) if vertical else (along, shift)
+        return target.mask.overlap(mover.mask, offset) is not None
+
+    if overlaps(0):
+        return start
+
+    # `mover` is in a hollow of `target` (e.g. inside a cup) -> probe pixel by pixel,
+    # as far as `mover` gets or until it has passed `target` completely
+    if sign > 0:
+        end = target_along + target_size - 1 - mover_along
+    else:
+        end = mover_along + mover_size - 1 - target_along
+    if reach is not None:
+        end = min(end, reach)
+
+    for distance in range(1, end + 1):
+        if overlaps(distance):
+            return distance
+
+    return None
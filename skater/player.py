@@ -20,6 +20,13 @@ class Player(pygame.sprite.Sprite):
     # factor used to calculate max jump height, used to multiply player's speed unit
     LEAP_FORCE = 5
 
+    # all the images the player is drawn with, see `handle_images`
+    IMAGES = [
+        image_paths.PLAYER_MAIN,
+        image_paths.PLAYER_MANUAL,
+        image_paths.PLAYER_NOSE_MANUAL,
+        image_paths.PLAYER_CRASH]
+
     def __init__(self, speed_unit=1):
         super().__init__()
 
@@ -57,9 +64,15 @@ class Player(pygame.sprite.Sprite):
         return self.v_x < 0
 
     # handle user input
-    def move(self, screen, event, gameboard):
-        
-        keystate = pygame.key.get_pressed()
+    def move(self, screen, events, gameboard, keystate=None):
+        """
+        `events` - the events since the previous move, oldest first (e.g. an `EventBatch`)
+
+        `keystate` is indexed by key codes, like the result of `pygame.key.get_pressed()`,
+        which is used if no `keystate` is passed in
+        """
+        if keystate is None:
+            keystate = pygame.key.get_pressed()
 
         if not self.is_mid_air():
 
@@ -77,15 +90,16 @@ class Player(pygame.sprite.Sprite):
 
 
         # set flags for jumping based on user input and for deceleration if user stops pressing movement buttons
-        if event.type == pygame.KEYDOWN:
-            #if event.key in [CONTROLS["G_RIGHT"], CONTROLS["G_LEFT"]]:
-            #    self.stop_movement_x()
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                #if event.key in [CONTROLS["G_RIGHT"], CONTROLS["G_LEFT"]]:
+                #    self.stop_movement_x()
 
-            if event.key in CONTROLS["G_OLLIE"]:
-                self.jump()
+                if event.key in CONTROLS["G_OLLIE"]:
+                    self.jump()
 
-        elif event.type == pygame.KEYUP:
-            self.is_manual = False
+            elif event.type == pygame.KEYUP:
+                self.is_manual = False
 
 
         # call movement functions after handling user input
@@ -94,17 +108,12 @@ class Player(pygame.sprite.Sprite):
     
     def call_movement_functions(self, gameboard):
         
-        self.move_x(gameboard)
-        self.move_y(gameboard)
+        self.update_velocity()
+        self.move_swept(gameboard)
         self.handle_images()
 
 
-    def move_x(self, gameboard):
-        # find x position of the closest obstacle edges on the right and left side of the player
-        limit_right = gameboard.limit_right(self)
-        limit_left = gameboard.limit_left(self)
-
-        # update the speed for the next iteration
+    def update_velocity(self):
         if not self.is_mid_air():
             # decrease velocity using drag parameter but only if on the ground
             self.v_x *= self.DRAG
@@ -113,35 +122,40 @@ class Player(pygame.sprite.Sprite):
         if abs(self.v_x) <= self.ZERO:
             self.v_x = 0
 
-        # stop movement if collision on either side of the player takes place
-        if self.is_moving_right() and self.v_x > limit_right:
-            wall = self.rect.right + limit_right
-            self.stop_movement_x(wall - self.rect.width)
-        
-        elif self.is_moving_left() and self.v_x < limit_left:
-            wall = self.rect.left + limit_left
-            self.stop_movement_x(wall)
-        
+        # Calculate y-acceleration (gravity pull) and update y-speed with it
+        self.v_y += self.m * self.G
+
+    def move_swept(self, gameboard):
+        """
+        Moves the player by their velocity: horizontally, then vertically, one `GameBoard.sweep` per axis.
+        The sweeps cover the whole distance travelled in the tick - nothing is skipped, however fast the player is.
+        """
+        self.move_x(gameboard)
+        self.move_y(gameboard)
+
+    def move_x(self, gameboard):
+        contact = gameboard.sweep(self, (self.v_x, 0)) if self.v_x else None
+
+        # an obstacle reached exactly at the end of the move doesn't stop the player yet
+        if contact is not None and contact.time < 1:
+            # `sweep` already keeps the player 1 pixel before the wall
+            self.stop_movement_x(self.rect.x + contact.time * self.v_x)
         else:
-            # Free movement -> update the position based on the speed
+            # the whole tick's distance at once -> rounded to whole pixels once
             self.rect.x += self.v_x
 
     def move_y(self, gameboard):
-        limit = gameboard.limit_under(self)
-
-        # Calculate y-acceleration (gravity pull)
-        a = self.m * self.G
-
-        # Update y-speed with new acceleration
-        self.v_y += a
+        # lines are ridden: the distance down to a line under the feet, negative for a ramp going up.
+        # The player is lifted onto an obstacle they are sunk into the same way.
+        limit = min(gameboard.ramp_limit(self), gameboard.sunk_limit(self))
 
-        will_hit_floor = self.v_y > limit
+        contact = gameboard.sweep(self, (0, self.v_y)) if self.v_y else None
+        if contact is not None:
+            limit = min(limit, contact.time * self.v_y)
 
-        if will_hit_floor:
-            floor = self.rect.bottom + limit
-            self.stop_movement_y(floor)
+        if self.v_y > limit:
+            self.stop_movement_y(self.rect.bottom + limit)
         else:
-            # Update y-position
             self.rect.y += self.v_y
 
     def jump(self):
@@ -0,0 +1,87 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+from .image import Image
+from .level_cache import LevelCache, OBSTACLES_CACHE_PATH
+from .obstacles_list import OBSTACLES
+from .player import Player
+
+
+class Preloader:
+    """
+    Decodes images and builds levels on worker threads, e.g. while the menu is showing.
+
+    Results are handed over on the main thread: `collect_images` moves the decoded images into
+    `Image.surface_cache`, `load_level` returns a preloaded level. Both wait only for the
+    jobs which aren't finished yet, anything that was never submitted is loaded synchronously.
+
+    Nothing is loaded until `start` is called - no threads are started and no files are written before.
+    """
+    def __init__(self, max_workers=4, level_cache_path=OBSTACLES_CACHE_PATH):
+        self.max_workers = max_workers
+        self.executor = None
+
+        # where the game's level (`OBSTACLES`) is compiled to
+        self.level_cache_path = level_cache_path
+
+        # jobs not handed over yet
+        # path -> future of the decoded (not yet converted) surface
+        self.images = {}
+
+        # cache path -> future of the `LevelCache`
+        self.levels = {}
+
+    def start(self, paths, levels):
+        """
+        Submits the images at `paths` and the `levels` ([(definitions, cache path)]) not submitted yet
+        """
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix="preloader")
+
+        for path in paths:
+            if path not in self.images and path not in Image.surface_cache:
+                self.images[path] = self.executor.submit(pygame.image.load, path)
+
+        for definitions, cache_path in levels:
+            if cache_path not in self.levels:
+                self.levels[cache_path] = self.executor.submit(
+                    LevelCache.load_or_compile, definitions, cache_path)
+
+    def start_game_assets(self):
+        """
+        Everything a `Game` needs to start: the player's images and the level
+        """
+        self.start(Player.IMAGES, [(OBSTACLES, self.level_cache_path)])
+
+    def progress(self):
+        """
+        (finished, submitted) of the jobs not handed over yet
+        """
+        jobs = list(self.images.values()) + list(self.levels.values())
+        return sum(job.done() for job in jobs), len(jobs)
+
+    def collect_images(self):
+        """
+        Moves the decoded images into `Image.surface_cache`, waiting for the unfinished ones
+        """
+        images, self.images = self.images, {}
+        for path, job in images.items():
+            # converting to the display's format is done on the main thread, which owns the display
+            Image.surface_cache.put(path, Image.convert(job.result()))
+
+    def load_level(self, definitions, cache_path):
+        """
+        The preloaded level cached at `cache_path`, loaded now if it wasn't preloaded.
+
+        A preloaded level is handed over once - its obstacles belong to the game that picks it up.
+        """
+        job = self.levels.pop(cache_path, None)
+        if job is None:
+            return LevelCache.load_or_compile(definitions, cache_path)
+
+        return job.result()
+
+
+# shared by the menu, which starts loading, and the game, which picks the results up
+preloader = Preloader()
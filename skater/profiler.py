@@ -0,0 +1,176 @@
+import csv
+import json
+import time
+
+import numpy as np
+import pygame
+
+
+class _NoPhase:
+    """
+    Returned by `Profiler.phase` when profiling is disabled - does nothing
+    """
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+NO_PHASE = _NoPhase()
+
+
+class _Phase:
+    def __init__(self, frame, column):
+        self.frame = frame
+        self.column = column
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc_info):
+        self.frame[self.column] += time.perf_counter() - self.start
+
+
+class Profiler:
+    """
+    Records per frame phase durations (seconds) and counters into a fixed-size ring buffer.
+
+    Usage:
+        with profiler.phase("draw"):
+            ...
+        profiler.count("blits")
+        profiler.end_frame()
+
+    Disabled by default, in which case `phase` and `count` return immediately.
+    """
+    PHASES = ("frame", "events", "run", "camera", "streaming", "physics", "display_frame", "draw", "display_update")
+    COUNTERS = ("collision_tests", "blits", "cache_hits")
+
+    def __init__(self, capacity=900, enabled=False):
+        self.enabled = enabled
+        self.show_overlay = False
+
+        self.columns = {name: i for i, name in enumerate(self.PHASES + self.COUNTERS)}
+        self.records = np.zeros((capacity, len(self.columns)))
+        self.frames = 0  # total number of recorded frames, the ring buffer holds the last `capacity`
+
+        self.current = np.zeros(len(self.columns))
+        self.frame_start = None
+
+        # caches whose hits are counted each frame: [(cache, hits at the end of the previous frame)]
+        self.caches = []
+
+        self.font = None
+
+    def phase(self, name):
+        if not self.enabled:
+            return NO_PHASE
+
+        return _Phase(self.current, self.columns[name])
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.current[self.columns[name]] += n
+
+    def watch_cache(self, cache):
+        """
+        Counts the hits of an `LRUCache` as "cache_hits"
+        """
+        self.caches.append([cache, cache.hits])
+
+    def end_frame(self):
+        """
+        Stores the current frame's record and starts a new one
+        """
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        if self.frame_start is not None:
+            self.current[self.columns["frame"]] = now - self.frame_start
+        self.frame_start = now
+
+        for watched in self.caches:
+            cache, previous_hits = watched
+            # a cleared cache starts counting from 0 again
+            self.count("cache_hits", cache.hits - previous_hits if cache.hits >= previous_hits else cache.hits)
+            watched[1] = cache.hits
+
+        self.records[self.frames % len(self.records)] = self.current
+        self.frames += 1
+        self.current = np.zeros(len(self.columns))
+
+    def history(self):
+        """
+        The recorded frames, oldest first
+        """
+        capacity = len(self.records)
+        if self.frames <= capacity:
+            return self.records[:self.frames]
+
+        start = self.frames % capacity
+        return np.concatenate([self.records[start:], self.records[:start]])
+
+    def percentiles(self, name, percents=(50, 95, 99)):
+        values = self.history()[:, self.columns[name]]
+        if len(values) == 0:
+            return [0 for _ in percents]
+
+        return np.percentile(values, percents).tolist()
+
+    def dump_csv(self, path):
+        with open(path, "w", newline="") as output:
+            writer = csv.writer(output)
+            writer.writerow(self.PHASES + self.COUNTERS)
+            writer.writerows(self.history().tolist())
+
+    def dump_json(self, path):
+        names = self.PHASES + self.COUNTERS
+        with open(path, "w") as output:
+            json.dump({
+                "columns": names,
+                "percentiles": {name: dict(zip(("p50", "p95", "p99"), self.percentiles(name))) for name in names},
+                "frames": self.history().tolist(),
+            }, output)
+
+    def draw_overlay(self, screen):
+        """
+        Draws a frame time graph and the phases' percentiles (ms) in the top left corner.
+        Returns the area drawn onto.
+        """
+        BLACK = (0, 0, 0); GREEN = (0, 200, 0)
+        width, height = 360, 95 + 16 * len(self.columns)
+
+        background = pygame.Surface((width, height), flags=pygame.SRCALPHA)
+        background.fill((255, 255, 255, 200))
+        area = screen.blit(background, (0, 0))
+
+        # frame times of the last `width` frames, the graph's height is 40 ms
+        frame_times = self.history()[-width:, self.columns["frame"]] * 1000
+        if len(frame_times) > 1:
+            points = [
+                (x, 70 - min(frame_time, 40) * 60 / 40)
+                for x, frame_time in enumerate(frame_times)]
+            pygame.draw.lines(screen, GREEN, False, points)
+
+        # pygame's default font - no system font lookup
+        self.font = self.font or pygame.font.Font(None, 18)
+
+        lines = ["phase  p50 / p95 / p99 ms"]
+        for name in self.PHASES:
+            p50, p95, p99 = (1000 * value for value in self.percentiles(name))
+            lines.append("{}  {:.2f} / {:.2f} / {:.2f}".format(name, p50, p95, p99))
+
+        lines.append("counter  p50 / p95 / p99 per frame")
+        for name in self.COUNTERS:
+            lines.append("{}  {:.0f} / {:.0f} / {:.0f}".format(name, *self.percentiles(name)))
+
+        for i, text in enumerate(lines):
+            screen.blit(self.font.render(text, False, BLACK), (5, 72 + i * 16))
+
+        return area
+
+
+# shared by the main loop and the instrumented code
+profiler = Profiler()
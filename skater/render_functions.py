@@ -1,18 +1,55 @@
+import pygame
+
+from .cache import LRUCache
+from .dirty_rects import dirty_rects
+from .profiler import profiler
+
+# system font lookups are slow -> every (name, size) is looked up once
+fonts = LRUCache(capacity=16)
+
+# rendered text, keyed by (text, font, color) -> unchanged labels are not rendered again
+text_surfaces = LRUCache(capacity=256)
+
+
+def get_font(name, size):
+    return fonts.get(
+        (name, size),
+        lambda: pygame.font.SysFont(name, size))
+
+
+def render_text(text, font, color):
+    """
+    The returned surface is shared - it must not be drawn onto
+    """
+    return text_surfaces.get(
+        (text, font, tuple(color)),
+        lambda: font.render(text, False, color))
+
+
 def draw_text(screen, text, font, color, side, side_px, top_px):
 
-    text_screen = font.render(text, False, color)
+    text_screen = render_text(text, font, color)
     text_screen_rect = text_screen.get_rect()
     text_screen_rect.top = top_px
     if side == "R": text_screen_rect.right = side_px
     if side == "L": text_screen_rect.left = side_px
 
-    screen.blit(text_screen, text_screen_rect)
-
+    # a label is identified by where it is anchored -> only a changed text is pushed to the window
+    dirty_rects.draw((side, side_px, top_px), screen.blit(text_screen, text_screen_rect), text_screen)
+    profiler.count("blits")
 
-def draw_rect(screen, camera, rect, image = None):
 
+def draw_rect(screen, camera, rect, image = None, key = None):
+    """
+    `key` identifies the drawn sprite between frames (see `DirtyRects.draw`), the image's surface by default
+    """
     rendering_position = (rect.x - camera.x, rect.y - camera.y)
-    screen.blit(image.raw_image, rendering_position)
+    drawn = screen.blit(image.raw_image, rendering_position)
+    if key is None:
+        dirty_rects.draw(image.raw_image, drawn)
+    else:
+        dirty_rects.draw(key, drawn, image.raw_image)
+    profiler.count("blits")
 
 
 def draw_line(screen, camera, start_pos, end_pos, color):
@@ -20,4 +57,4 @@ def draw_line(screen, camera, start_pos, end_pos, color):
     start_rendering_position = (start_pos.x - camera.x, start_pos.y - camera.y)
     end_rendering_position = (start_pos.x - camera.x, start_pos.y - camera.y)
 
-    pygame.draw.line(screen, color, start_rendering_position, end_rendering_position, width=1)
\ No newline at end of file
+    dirty_rects.add(pygame.draw.line(screen, color, start_rendering_position, end_rendering_position, width=1))
\ No newline at end of file
@@ -3,11 +3,32 @@ from math import inf
 class Edge:
     """
     A 1 point wide line connectng two vertices.
+
+    The linear equation parameters are computed on first use and cached;
+    replacing `start` or `end` clears the cache.
     """
     def __init__(self, start, end):
         self.start = start
         self.end = end
 
+    @property
+    def start(self):
+        return self._start
+
+    @start.setter
+    def start(self, point):
+        self._start = point
+        self._equation_params = None
+
+    @property
+    def end(self):
+        return self._end
+
+    @end.setter
+    def end(self, point):
+        self._end = point
+        self._equation_params = None
+
     def __repr__(self):
         return "Edge: {}, {}".format(self.start, self.end)
 
@@ -24,6 +45,15 @@ class Edge:
         A line segment is a linear function with boundaries. The function may be used
         to compute if a point lies on the line
         """
+        if self._equation_params is None:
+            self._equation_params = self.compute_equation_params()
+
+        return self._equation_params
+
+    def compute_equation_params(self):
+        """
+        see `get_equation_params`
+        """
         # order points by their position on the x axis
         left, right = sorted(
             [self.start, self.end],
@@ -61,6 +91,25 @@ class Edge:
         else:
             return False
 
+    def top_between(self, x_low, x_high):
+        """
+        The smallest y (the highest point) of the edge within the <x_low, x_high> range,
+        None if the edge doesn't reach into the range.
+
+        Constant time - the extremes of a line segment lie at the ends of the range.
+        """
+        a, b, x_boundaries, y_boundaries = self.get_equation_params()
+
+        low = max(x_low, x_boundaries[0])
+        high = min(x_high, x_boundaries[1])
+        if low > high:
+            return None
+
+        if a == inf:
+            return y_boundaries[0]
+
+        return min(a * low + b, a * high + b)
+
     def distance_x(self, point):
         """
         Given a `point`, returns a shortest distance in the x axis from `self`
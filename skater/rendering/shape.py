@@ -1,7 +1,6 @@
-from math import sqrt, ceil
+from math import sqrt, ceil, floor, inf
 
 import numpy as np
-from PIL import Image, ImageDraw
 import pygame
 
 from .point import Point
@@ -21,11 +20,56 @@ class Shape:
 class Polygon(Shape):
     """
     A Polygon is defined by a list of vertices.
+
+    The vertices are stored in an (N, 2) numpy array (`points`), which `shift` translates in place.
+    `vertices` are `Point` copies built from the array on demand and reused until the next move.
+
+    Edges are built once and reused until the shape moves.
+    The bounding box is kept up to date (moved along by `shift`), so reading
+    `left / right / top / bottom / width / height / x / y` costs an attribute load.
+    The vertex list should therefore never be modified in place.
     """
     def __init__(self, vertices):
         assert(len(vertices) > 0)
         self.vertices = vertices
 
+    @classmethod
+    def from_array(cls, points):
+        """
+        Builds a Polygon directly on top of an (N, 2) array of x, y pairs (the array is not copied)
+        """
+        polygon = cls.__new__(cls)
+        polygon.set_points(points)
+        return polygon
+
+    @property
+    def points(self):
+        return self._points
+
+    @property
+    def vertices(self):
+        if self._vertices is None:
+            self._vertices = [Point(x, y) for x, y in self._points.tolist()]
+
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices):
+        self.set_points(np.array([(vertex.x, vertex.y) for vertex in vertices]))
+        self._vertices = vertices
+
+    def set_points(self, points):
+        assert(points.ndim == 2 and points.shape[0] > 0 and points.shape[1] == 2)
+        self._points = points
+        self._vertices = None
+        self._edges = None
+        self._centre = None
+        self._radius = None
+
+        # `tolist` -> plain python numbers, numpy scalars should not leak out of the class
+        self._left, self._top = points.min(axis=0).tolist()
+        self._right, self._bottom = points.max(axis=0).tolist()
+
     def __repr__(self):
         return "{}: {}".format(
             self.__class__.__name__,
@@ -36,7 +80,7 @@ class Polygon(Shape):
         return isinstance(other, Polygon) and self.vertices == other.vertices
 
     def clone(self):
-        return Polygon(self.vertices[:])
+        return self.__class__.from_array(self._points.copy())
 
     def shifted(self, x_shift=0, y_shift=0):
         result = self.clone()
@@ -50,14 +94,26 @@ class Polygon(Shape):
 
         Mean value of vertices along each axis.
         """
-        mean_x = sum(vertex.x for vertex in self.vertices) / len(self.vertices)
-        mean_y = sum(vertex.y for vertex in self.vertices) / len(self.vertices)
-        return Point(mean_x, mean_y)
+        if self._centre is None:
+            mean_x = sum(vertex.x for vertex in self.vertices) / len(self.vertices)
+            mean_y = sum(vertex.y for vertex in self.vertices) / len(self.vertices)
+            self._centre = Point(mean_x, mean_y)
+
+        return self._centre
 
     def radius(self):
         """
         Distance between the centre and the most distant vertex
         """
+        if self._radius is None:
+            self._radius = self.compute_radius()
+
+        return self._radius
+
+    def compute_radius(self):
+        """
+        see `radius`
+        """
         centre = self.centre()
 
         # Distance between each vertex and the centre, for each axis.
@@ -74,72 +130,145 @@ class Polygon(Shape):
         return ceil(max(distances))
 
     def edges(self):
-        # a list of self.vertives, but shifted by 1 index
-        next_vertices = self.vertices[1:] + self.vertices[0:1]
+        """
+        Edges connecting consecutive vertices. The returned list is shared - do not modify it.
+        """
+        if self._edges is None:
+            # a list of self.vertives, but shifted by 1 index
+            next_vertices = self.vertices[1:] + self.vertices[0:1]
 
-        # pairs of (self.vertices[i], self.vertices[i+1])
-        vertex_pairs = zip(self.vertices, next_vertices)
+            # pairs of (self.vertices[i], self.vertices[i+1])
+            vertex_pairs = zip(self.vertices, next_vertices)
 
-        return [
-            Edge(vertex, next_vertex)
-            for vertex, next_vertex in vertex_pairs
-        ]
+            self._edges = [
+                Edge(vertex, next_vertex)
+                for vertex, next_vertex in vertex_pairs
+            ]
+
+        return self._edges
+
+    def mask_bounds(self):
+        """
+        Pixels covered by the shape's bounding box (borders included): left, top, width, height
+        """
+        left = floor(self._left)
+        top = floor(self._top)
+        return left, top, ceil(self._right) - left + 1, ceil(self._bottom) - top + 1
 
     def build_surface_mask(self):
         """
         Builds a 2d array describing the shape on a rectangular surface
+
+        The array only covers `mask_bounds` - mask[0][0] is the pixel at (left, top).
         """
-        size = 2 * self.radius()
+        left, top, width, height = self.mask_bounds()
+        mask = np.zeros((height, width), dtype=np.uint8)
 
-        # Create an empty spline image
-        img = Image.new('L', (size, size))
+        starts = self._points - (left, top)
+        ends = np.roll(starts, -1, axis=0)
 
-        # Draw a polygon onto the image
-        vertices = [
-            (v.x, v.y)
-            for v in self.vertices
-        ]
-        ImageDraw.Draw(img).polygon(vertices, outline=1, fill=1)
+        self._fill_scanlines(mask, starts, ends)
 
-        # Get a 2D array of pixel values
-        mask = np.array(img)
+        # Draw the outline, so that the borders are always a part of the shape
+        for (x0, y0), (x1, y1) in zip(starts.tolist(), ends.tolist()):
+            steps = ceil(max(abs(x1 - x0), abs(y1 - y0)))
+            t = np.linspace(0, 1, steps + 1)
+            xs = np.clip(np.rint(x0 + t * (x1 - x0)).astype(int), 0, width - 1)
+            ys = np.clip(np.rint(y0 + t * (y1 - y0)).astype(int), 0, height - 1)
+            mask[ys, xs] = 1
 
         return mask
 
+    @staticmethod
+    def _fill_scanlines(mask, starts, ends):
+        """
+        Sets the pixels between pairs of edge crossings on every row of `mask`
+        """
+        height, width = mask.shape
+        rows = np.arange(height)[:, np.newaxis]
+        x0, y0 = starts[:, 0], starts[:, 1]
+        x1, y1 = ends[:, 0], ends[:, 1]
+
+        # half-open y ranges -> a vertex shared by two edges is crossed only once
+        crossed = (np.minimum(y0, y1) <= rows) & (rows < np.maximum(y0, y1))
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            crossings = x0 + (rows - y0) * (x1 - x0) / (y1 - y0)
+
+        # one row per scanline, crossings ordered left to right (missing ones at the end)
+        crossings = np.sort(np.where(crossed, crossings, np.nan), axis=1)
+        if crossings.shape[1] % 2:
+            crossings = np.hstack([crossings, np.full((height, 1), np.nan)])
+
+        span_starts = crossings[:, 0::2]
+        span_ends = crossings[:, 1::2]
+        valid = ~np.isnan(span_starts) & ~np.isnan(span_ends)
+
+        row_indices = np.broadcast_to(rows, span_starts.shape)[valid]
+        first = np.clip(np.ceil(span_starts[valid]).astype(int), 0, width)
+        last = np.clip(np.floor(span_ends[valid]).astype(int) + 1, 0, width)
+
+        # +1 where a span starts, -1 after it ends -> a running sum marks the covered pixels
+        changes = np.zeros((height, width + 1), dtype=int)
+        np.add.at(changes, (row_indices, first), 1)
+        np.add.at(changes, (row_indices, last), -1)
+        mask[np.cumsum(changes[:, :-1], axis=1) > 0] = 1
+
     def shift(self, delta):
-        self.vertices = [vertex + delta for vertex in self.vertices]
+        x_shift, y_shift = (delta.x, delta.y) if isinstance(delta, Point) else delta
+        if x_shift == 0 and y_shift == 0:
+            return
+
+        try:
+            self._points += (x_shift, y_shift)
+        except TypeError:
+            # an integer array can't be moved by a fraction in place -> switch to a float array
+            self._points = self._points + (x_shift, y_shift)
+
+        self._vertices = None
+        self._edges = None
+
+        # moving the shape doesn't change its size -> update the cached values instead of recomputing them
+
+        self._left += x_shift
+        self._right += x_shift
+        self._top += y_shift
+        self._bottom += y_shift
+
+        if self._centre is not None:
+            self._centre = self._centre + (x_shift, y_shift)
 
     @property
     def left(self):
-        return min(vertex.x for vertex in self.vertices)
+        return self._left
     
     @property
     def right(self):
-        return max(vertex.x for vertex in self.vertices)
+        return self._right
 
     @property
     def top(self):
-        return min(vertex.y for vertex in self.vertices)
+        return self._top
 
     @property
     def bottom(self):
-        return max(vertex.y for vertex in self.vertices)
+        return self._bottom
 
     @property
     def width(self):
-        return (self.right - self.left)
+        return (self._right - self._left)
 
     @property
     def height(self):
-        return (self.bottom - self.top)
+        return (self._bottom - self._top)
 
     @property
     def x(self):
-        return self.left
+        return self._left
 
     @property 
     def y(self):
-        return self.top
+        return self._top
 
     @x.setter
     def x(self, value):
@@ -195,7 +324,101 @@ class Polygon(Shape):
 
         return min(distances_to_other + distances_of_other, key=abs)
 
+class Rectangle(Polygon):
+    """
+    An axis-aligned Polygon with vertices ordered: top left, top right, bottom right, bottom left.
+
+    Distances between two Rectangles are computed in constant time from their boundaries.
+    The results are identical to the general `Polygon` ones (including the sign of ties).
+
+    Use `rectangle` to build one.
+    """
+    def build_surface_mask(self):
+        """
+        see `Polygon.build_surface_mask` - a rectangle covers its whole bounding box
+        """
+        left, top, width, height = self.mask_bounds()
+        return np.ones((height, width), dtype=np.uint8)
+
+    def corners(self):
+        """
+        (x, y) pairs of the vertices, read from the bounding box
+        """
+        left, right, top, bottom = self._left, self._right, self._top, self._bottom
+        return ((left, top), (right, top), (right, bottom), (left, bottom))
+
+    def distance_x(self, other):
+        if not isinstance(other, Rectangle):
+            return super().distance_x(other)
+
+        return _closest_of_corners(self, other, _corner_distance_x)
+
+    def distance_y(self, other):
+        if not isinstance(other, Rectangle):
+            return super().distance_y(other)
+
+        return _closest_of_corners(self, other, _corner_distance_y)
+
+
+def _corner_distance_x(x, y, rect):
+    """
+    Equivalent of `min([edge.distance_x(Point(x, y)) for edge in rect.edges()], key=abs)`
+    """
+    left, right, top, bottom = rect.left, rect.right, rect.top, rect.bottom
+
+    if not top <= y <= bottom:
+        return inf
+
+    # the point lies on the top or bottom edge
+    if (y == top or y == bottom) and left <= x <= right:
+        return 0
+
+    # the right edge comes before the left one -> it wins ties
+    to_right = right - x
+    to_left = left - x
+    return to_right if abs(to_right) <= abs(to_left) else to_left
+
+
+def _corner_distance_y(x, y, rect):
+    """
+    Equivalent of `min([edge.distance_y(Point(x, y)) for edge in rect.edges()], key=abs)`
+    """
+    if not rect.left <= x <= rect.right:
+        return inf
+
+    # the top edge comes before the bottom one -> it wins ties
+    to_top = rect.top - y
+    to_bottom = rect.bottom - y
+    return to_top if abs(to_top) <= abs(to_bottom) else to_bottom
+
+
+def _closest_of_corners(rect, other, distance):
+    """
+    Mirrors the `Polygon.distance_*` reduction: the first distance with the smallest absolute value wins
+    """
+    closest = inf
+
+    for x, y in rect.corners():
+        value = distance(x, y, other)
+        if abs(value) < abs(closest):
+            closest = value
+
+    # -1 due to an inverted orientation
+    for x, y in other.corners():
+        value = -1 * distance(x, y, rect)
+        if abs(value) < abs(closest):
+            closest = value
+
+    return closest
+
+
 def rectangle(top_left, bottom_right):
     bottom_left = Point(top_left.x, bottom_right.y)
     top_right = Point(bottom_right.x, top_left.y)
-    return Polygon([top_left, top_right, bottom_right, bottom_left])
\ No newline at end of file
+    vertices = [top_left, top_right, bottom_right, bottom_left]
+
+    # flat or inverted rectangles don't have the edge layout `Rectangle` relies on
+    if top_left.x < bottom_right.x and top_left.y < bottom_right.y:
+        return Rectangle(vertices)
+    else:
+        return Polygon(vertices)
\ No newline at end of file
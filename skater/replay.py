@@ -0,0 +1,145 @@
+import json
+
+import pygame
+
+from .dicts import CONTROLS
+from .game import Game
+from .input_dispatcher import EventBatch
+from .simulation import InputState
+
+
+# keys the physics reads from the keyboard state each tick - the only ones worth recording
+RECORDED_KEYS = sorted({key for name, keys in CONTROLS.items() if name.startswith("G_") for key in keys})
+
+# events `Player.move` reacts to, stored as (type, key)
+RECORDED_EVENTS = (pygame.KEYDOWN, pygame.KEYUP)
+
+
+class Recording:
+    """
+    The input of every physics tick of a `Game`: the recorded keys held down and the tick's events.
+
+    Attach one to `Game.recording` to record, replay it with `Replay`.
+    Saved as JSON, consecutive identical ticks are stored once with a repeat count.
+    """
+    VERSION = 2
+
+    def __init__(self, inputs=None, tick=Game.TICK):
+        self.inputs = inputs or []
+
+        # duration of a tick (seconds) the input was recorded at
+        self.tick = tick
+
+    def __len__(self):
+        return len(self.inputs)
+
+    def record(self, events, keystate):
+        """
+        Stores one tick's input. `keystate` is indexed by key codes, like `pygame.key.get_pressed()`
+        """
+        pressed = [key for key in RECORDED_KEYS if keystate[key]]
+        events = [
+            pygame.event.Event(event.type, key=event.key)
+            for event in events if event.type in RECORDED_EVENTS]
+
+        self.inputs.append(InputState(pressed, events))
+
+    def save(self, path):
+        runs = []
+        for input_state in self.inputs:
+            encoded = [sorted(input_state.pressed), [encode_event(event) for event in input_state.events]]
+            if runs and runs[-1][1:] == encoded:
+                runs[-1][0] += 1
+            else:
+                runs.append([1] + encoded)
+
+        with open(path, "w") as output:
+            json.dump({"version": self.VERSION, "tick": self.tick, "inputs": runs}, output, separators=(",", ":"))
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as recording_file:
+            data = json.load(recording_file)
+
+        if data.get("version") != cls.VERSION:
+            raise ValueError("Unsupported recording version: {}".format(data.get("version")))
+
+        inputs = []
+        for count, pressed, events in data["inputs"]:
+            inputs.extend(
+                InputState(pressed, [decode_event(event) for event in events])
+                for _ in range(count))
+
+        return cls(inputs, data["tick"])
+
+
+def encode_event(event):
+    return [event.type, event.key]
+
+
+def decode_event(encoded):
+    event_type, key = encoded
+    return pygame.event.Event(event_type, key=key)
+
+
+class Replay:
+    """
+    Plays a `Recording` back through `Game.run`, tick by tick, so the player follows
+    exactly the recorded trajectory.
+
+    `realtime` - paced at the game's frame rate, otherwise frames are run as fast as possible
+    """
+    FPS = 90
+
+    def __init__(self, recording, realtime=False):
+        self.recording = recording
+        self.realtime = realtime
+
+    def run(self, game, screen, background_image=None):
+        """
+        Runs frames until every recorded tick was replayed or the game is over.
+
+        Frames are drawn only if a `background_image` is passed in. Returns the number of ticks replayed.
+        """
+        if self.recording.tick != game.TICK:
+            raise ValueError("Recorded with a tick of {}s, the game runs {}s".format(self.recording.tick, game.TICK))
+
+        game_clock = game.clock
+        if not self.realtime:
+            game.clock = FrameClock(game.TICK)
+        clock = pygame.time.Clock()
+
+        game.replay = iter(self.recording.inputs)
+        first_tick = game.ticks
+
+        while game.replay is not None and game.ticks - first_tick < len(self.recording) and not game.game_over:
+            # the live input is ignored until the replay is over, the window is kept responsive
+            if pygame.display.get_init():
+                pygame.event.pump()
+            game.run(screen, EventBatch())
+
+            if background_image is not None:
+                game.display_frame(screen, background_image)
+
+            if self.realtime:
+                clock.tick(self.FPS)
+
+        # back to the live input, timed from the next frame
+        game.replay = None
+        game.clock = game_clock
+        game.last_time = None
+
+        return game.ticks - first_tick
+
+
+class FrameClock:
+    """
+    A clock advancing by exactly `step` seconds each time it is read - one tick per frame
+    """
+    def __init__(self, step):
+        self.step = step
+        self.time = 0
+
+    def __call__(self):
+        self.time += self.step
+        return self.time
@@ -0,0 +1,82 @@
+class _Node:
+    def __init__(self, centre, intervals, left, right):
+        self.centre = centre
+
+        # the intervals containing `centre`, sorted by their low end (ascending) and high end (descending)
+        self.by_low = sorted(intervals, key=lambda interval: interval[0])
+        self.by_high = sorted(intervals, key=lambda interval: -interval[1])
+
+        self.left = left
+        self.right = right
+
+
+class SegmentIndex:
+    """
+    A static interval tree of items keyed on their x range (e.g. line obstacles).
+
+    `query` finds the items overlapping an x range in O(log n + k) - the cost depends on how many
+    items are actually there, not on how many there are in the whole level.
+    """
+    def __init__(self, items, key):
+        """
+        `key(item)` returns the (low, high) x range of the item
+        """
+        intervals = []
+        for item in items:
+            low, high = key(item)
+            intervals.append((low, high, item))
+
+        self.items = [item for _, _, item in intervals]
+        self.root = self.build(intervals)
+
+    def __len__(self):
+        return len(self.items)
+
+    @classmethod
+    def build(cls, intervals):
+        if not intervals:
+            return None
+
+        # the median of the midpoints splits the remaining intervals roughly in half
+        midpoints = sorted((low + high) / 2 for low, high, _ in intervals)
+        centre = midpoints[len(midpoints) // 2]
+
+        left = [interval for interval in intervals if interval[1] < centre]
+        right = [interval for interval in intervals if interval[0] > centre]
+        here = [interval for interval in intervals if interval[0] <= centre <= interval[1]]
+
+        return _Node(centre, here, cls.build(left), cls.build(right))
+
+    def query(self, low, high):
+        """
+        The items whose x range overlaps <low, high>
+        """
+        found = []
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            if node is None:
+                continue
+
+            if high < node.centre:
+                # everything to the right of the centre starts after `high`
+                for interval in node.by_low:
+                    if interval[0] > high:
+                        break
+                    found.append(interval[2])
+                nodes.append(node.left)
+
+            elif low > node.centre:
+                for interval in node.by_high:
+                    if interval[1] < low:
+                        break
+                    found.append(interval[2])
+                nodes.append(node.right)
+
+            else:
+                # <low, high> contains the centre -> so do all of the node's intervals
+                found.extend(interval[2] for interval in node.by_low)
+                nodes.append(node.left)
+                nodes.append(node.right)
+
+        return found
@@ -0,0 +1,78 @@
+import pygame
+
+from .game import Game
+from .input_dispatcher import EventBatch
+
+
+class InputState:
+    """
+    Scripted input for a single tick: the keys held down and the events, oldest first.
+
+    Indexing by a key code mimics `pygame.key.get_pressed()`.
+    """
+    def __init__(self, pressed=(), events=()):
+        self.pressed = frozenset(pressed)
+        self.events = EventBatch(events)
+
+    def __getitem__(self, key):
+        return key in self.pressed
+
+    def __repr__(self):
+        return "InputState: {}, {}".format(sorted(self.pressed), self.events.events)
+
+
+class Simulation:
+    """
+    Steps a `Game` without a window: physics and collisions only, nothing is drawn
+    and the keyboard is never read - input is scripted with `InputState`s.
+    """
+    SCREEN_SIZE = (1280, 720)
+
+    def __init__(self, game=None, screen_size=SCREEN_SIZE):
+        self.game = game or Game()
+
+        # the camera only needs to know the size of the screen - a plain surface, not a window
+        self.screen = pygame.Surface(screen_size)
+
+        self.ticks = 0
+
+    @property
+    def player(self):
+        return self.game.player
+
+    def step(self, input_state=None):
+        """
+        Runs a single physics tick. Returns False if the game doesn't simulate anymore (game over, level won)
+        """
+        input_state = input_state or InputState()
+
+        if self.game.new_level:
+            self.game.start_level()
+
+        if self.game.game_over or self.game.won_level:
+            return False
+
+        self.game.tick(self.screen, input_state.events, input_state)
+        self.ticks += 1
+        return True
+
+    def run(self, inputs):
+        """
+        Runs one tick per `InputState` in `inputs`, stops early if the game stops simulating.
+
+        Returns the number of ticks run.
+        """
+        ticks = 0
+        for input_state in inputs:
+            if not self.step(input_state):
+                break
+            ticks += 1
+
+        return ticks
+
+    def run_for(self, ticks, input_state=None):
+        """
+        Runs `ticks` ticks with the same input (its events, if any, are repeated every tick)
+        """
+        input_state = input_state or InputState()
+        return self.run(input_state for _ in range(ticks))
@@ -0,0 +1,161 @@
+class SpatialHash:
+    """
+    A uniform grid index. Each item is stored in every cell its bounding box overlaps.
+
+    Queries return a superset of the items overlapping the requested cells, in insertion order,
+    so callers can apply their exact predicate on a much smaller candidate list.
+    """
+    def __init__(self, cell_size=256):
+        assert cell_size > 0, "Cell size has to be positive, got {}".format(cell_size)
+        self.cell_size = cell_size
+
+        # removed items leave a None behind, so that indices (and the insertion order) stay valid
+        self.items = []
+        self.removed = 0
+
+        # (column, row) -> indices of `self.items` overlapping the cell
+        self.cells = {}
+
+        # id(item) -> (index, cells the item is stored in)
+        self.locations = {}
+
+        # inclusive ranges of occupied columns / rows; empty until the first insert
+        self.columns = (0, -1)
+        self.rows = (0, -1)
+
+    def __len__(self):
+        return len(self.items) - self.removed
+
+    def cell(self, value):
+        """
+        Index of the cell containing the `value` coordinate (works for either axis)
+        """
+        return int(value // self.cell_size)
+
+    def cell_range(self, low, high):
+        """
+        Inclusive range of cell indices covering the <low, high> coordinates
+        """
+        return self.cell(low), self.cell(high)
+
+    def insert(self, item, rect):
+        """
+        Stores `item` in all cells overlapped by `rect` (anything with left / right / top / bottom)
+        """
+        index = len(self.items)
+        self.items.append(item)
+
+        first_column, last_column = self.cell_range(rect.left, rect.right)
+        first_row, last_row = self.cell_range(rect.top, rect.bottom)
+
+        cells = [
+            (column, row)
+            for column in range(first_column, last_column + 1)
+            for row in range(first_row, last_row + 1)]
+        for cell in cells:
+            self.cells.setdefault(cell, []).append(index)
+        self.locations[id(item)] = (index, cells)
+
+        if len(self) == 1:
+            self.columns = (first_column, last_column)
+            self.rows = (first_row, last_row)
+        else:
+            self.columns = (min(self.columns[0], first_column), max(self.columns[1], last_column))
+            self.rows = (min(self.rows[0], first_row), max(self.rows[1], last_row))
+
+    def remove(self, item):
+        """
+        Removes a previously inserted `item`. The occupied ranges are not shrunk - they stay a superset.
+        """
+        index, cells = self.locations.pop(id(item))
+        for cell in cells:
+            indices = self.cells[cell]
+            indices.remove(index)
+            if not indices:
+                del self.cells[cell]
+
+        self.items[index] = None
+        self.removed += 1
+
+        # keeps the memory and the occupied ranges proportional to the items actually stored
+        if self.removed > len(self):
+            self.compact()
+
+    def compact(self):
+        """
+        Drops the holes left by removed items and shrinks the occupied ranges to the remaining cells
+        """
+        new_indices = {}
+        items = []
+        for index, item in enumerate(self.items):
+            if item is not None:
+                new_indices[index] = len(items)
+                items.append(item)
+
+        self.items = items
+        self.removed = 0
+        self.cells = {
+            cell: [new_indices[index] for index in indices]
+            for cell, indices in self.cells.items()}
+        self.locations = {
+            key: (new_indices[index], cells)
+            for key, (index, cells) in self.locations.items()}
+
+        self.fit_ranges()
+
+    def fit_ranges(self):
+        """
+        Sets the occupied ranges to exactly the cells in use
+        """
+        if self.cells:
+            self.columns = (min(column for column, _ in self.cells), max(column for column, _ in self.cells))
+            self.rows = (min(row for _, row in self.cells), max(row for _, row in self.cells))
+        else:
+            self.columns = (0, -1)
+            self.rows = (0, -1)
+
+    def query(self, columns, rows):
+        """
+        Items stored in any cell within the inclusive `columns` x `rows` ranges.
+
+        Ranges are clipped to the occupied part of the grid.
+        """
+        first_column = max(columns[0], self.columns[0])
+        last_column = min(columns[1], self.columns[1])
+        first_row = max(rows[0], self.rows[0])
+        last_row = min(rows[1], self.rows[1])
+
+        found = set()
+        for column in range(first_column, last_column + 1):
+            for row in range(first_row, last_row + 1):
+                found.update(self.cells.get((column, row), ()))
+
+        return [self.items[index] for index in sorted(found)]
+
+    @classmethod
+    def from_cells(cls, items, cells, cell_size=256):
+        """
+        Restores an index from its `items` and `cells` (e.g. saved by a `LevelCache`)
+        """
+        index = cls(cell_size)
+        index.items = list(items)
+        index.cells = cells
+
+        stored_in = [[] for _ in index.items]
+        for cell, indices in cells.items():
+            for i in indices:
+                stored_in[i].append(cell)
+        index.locations = {id(item): (i, stored_in[i]) for i, item in enumerate(index.items)}
+
+        index.fit_ranges()
+        return index
+
+    @classmethod
+    def build(cls, items, key, cell_size=256):
+        """
+        Builds an index of `items`, where `key(item)` returns the item's bounding rect
+        """
+        index = cls(cell_size)
+        for item in items:
+            index.insert(item, key(item))
+        return index
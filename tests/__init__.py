@@ -0,0 +1,8 @@
+import os
+import tempfile
+
+from skater.preloader import preloader
+
+# games started by the tests compile their level into a temporary directory, not into the package
+_level_cache_directory = tempfile.TemporaryDirectory()
+preloader.level_cache_path = os.path.join(_level_cache_directory.name, "obstacles_list.levelcache")
@@ -38,6 +38,14 @@ class TestEdge(TestCase):
             edge.get_equation_params(),
             (0.1, 0, (0, 10), (0, 1)))
 
+    def test_get_equation_params_follows_moved_end(self):
+        edge = Edge(D, B)
+        edge.get_equation_params()
+        edge.end = E
+        self.assertEqual(
+            edge.get_equation_params(),
+            (0, 100, (0, 100), (100, 100)))
+
     def test_contains_positive(self):
         edge = Edge(D, B)
         self.assertTrue(
@@ -79,4 +87,16 @@ class TestEdge(TestCase):
         edge = Edge(D, E)
         self.assertEqual(
             edge.distance_y(F),
-            75)
\ No newline at end of file
+            75)
+
+class TestTopBetween(TestCase):
+    def test_returns_highest_point_within_range(self):
+        edge = Edge(D, B)  # y = 100 - x
+        self.assertEqual(edge.top_between(20, 40), 60)
+        self.assertEqual(edge.top_between(-50, 10), 90)
+
+    def test_range_outside_of_edge(self):
+        self.assertIsNone(Edge(D, B).top_between(150, 200))
+
+    def test_vertical_edge(self):
+        self.assertEqual(Edge(B, E).top_between(90, 110), 0)
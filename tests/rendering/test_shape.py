@@ -1,3 +1,4 @@
+import random
 from math import ceil, sqrt
 from unittest import TestCase
 
@@ -6,7 +7,7 @@ import pygame
 
 from skater.rendering.edge import Edge
 from skater.rendering.point import Point
-from skater.rendering.shape import Polygon, rectangle
+from skater.rendering.shape import Polygon, Rectangle, rectangle
 
 """ A set of points used by the tests
 A---B
@@ -46,15 +47,88 @@ class TestPolygon(TestCase):
             polygon.edges(),
             expected)
 
+    def test_edges_are_reused(self):
+        polygon = Polygon([A, B, C])
+        self.assertIs(
+            polygon.edges(),
+            polygon.edges())
+
+    def test_edges_follow_shift(self):
+        polygon = Polygon([A, B, C])
+        polygon.edges()
+        polygon.shift([1, 0])
+        self.assertEqual(
+            polygon.edges()[0],
+            Edge(A + (1, 0), B + (1, 0)))
+
+    def test_bounds(self):
+        polygon = Polygon([A, C, E])
+        self.assertEqual(
+            (polygon.left, polygon.top, polygon.right, polygon.bottom),
+            (0, 0, 4, 4))
+
+    def test_shift_moves_bounds_and_centre(self):
+        polygon = Polygon([A, B, E, D])
+        polygon.centre()
+        polygon.shift(Point(3, -1))
+        self.assertEqual(
+            (polygon.left, polygon.top, polygon.right, polygon.bottom),
+            (3, -1, 7, 3))
+        self.assertEqual(
+            polygon.centre(),
+            Point(5, 1))
+
+    def test_shift_moves_points_in_place(self):
+        polygon = Polygon([A, B, C])
+        points = polygon.points
+        polygon.shift([1, 2])
+        self.assertIs(polygon.points, points)
+        self.assertEqual(
+            polygon.vertices,
+            [Point(1, 2), Point(5, 2), Point(3, 4)])
+
+    def test_shift_by_a_fraction(self):
+        polygon = Polygon([A, B])
+        polygon.shift([0.5, 0])
+        self.assertEqual(
+            polygon.vertices,
+            [Point(0.5, 0), Point(4.5, 0)])
+
+    def test_clone_does_not_share_points(self):
+        polygon = Polygon([A, B, C])
+        clone = polygon.clone()
+        clone.shift([1, 1])
+        self.assertEqual(
+            polygon.vertices,
+            [A, B, C])
+
     def test_build_surface_mask(self):
         polygon = Polygon([A, B, C])
         expected = np.array([
-            [1, 1, 1, 1, 1, 0],
-            [0, 1, 1, 1, 0, 0],
-            [0, 0, 1, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0],
-            [0, 0, 0, 0, 0, 0]
+            [1, 1, 1, 1, 1],
+            [0, 1, 1, 1, 0],
+            [0, 0, 1, 0, 0]
+        ])
+        self.assertTrue(
+            np.array_equal(
+                polygon.build_surface_mask(),
+                expected))
+
+    def test_build_surface_mask_does_not_depend_on_position(self):
+        polygon = Polygon([A, B, C])
+        self.assertTrue(
+            np.array_equal(
+                polygon.shifted(x_shift=7, y_shift=-3).build_surface_mask(),
+                polygon.build_surface_mask()))
+
+    def test_build_surface_mask_of_concave_polygon(self):
+        polygon = Polygon([A, B, E, C, D])
+        expected = np.array([
+            [1, 1, 1, 1, 1],
+            [1, 1, 1, 1, 1],
+            [1, 1, 1, 1, 1],
+            [1, 1, 0, 1, 1],
+            [1, 0, 0, 0, 1]
         ])
         self.assertTrue(
             np.array_equal(
@@ -86,4 +160,41 @@ class TestRectangle(TestCase):
     def test_creates_a_polygon(self):
         self.assertEqual(
             rectangle(A, E),
-            Polygon([A, B, E, D]))
\ No newline at end of file
+            Polygon([A, B, E, D]))
+
+    def test_creates_a_rectangle_instance(self):
+        self.assertIsInstance(
+            rectangle(A, E),
+            Rectangle)
+
+    def test_flat_rectangle_is_a_general_polygon(self):
+        self.assertNotIsInstance(
+            rectangle(A, B),
+            Rectangle)
+
+    def test_shifted_is_a_rectangle(self):
+        self.assertIsInstance(
+            rectangle(A, E).shifted(x_shift=3),
+            Rectangle)
+
+    def test_distances_match_the_general_polygon(self):
+        # small coordinates -> plenty of touching / overlapping / tied cases
+        rng = random.Random(0)
+
+        def random_rectangle():
+            corner = Point(rng.randint(-6, 6), rng.randint(-6, 6))
+            return rectangle(corner, corner + (rng.randint(1, 6), rng.randint(1, 6)))
+
+        for _ in range(2000):
+            first, other = random_rectangle(), random_rectangle()
+            self.assertEqual(
+                first.distance_x(other),
+                Polygon.distance_x(first, other))
+            self.assertEqual(
+                first.distance_y(other),
+                Polygon.distance_y(first, other))
+
+    def test_build_surface_mask_covers_the_bounding_box(self):
+        mask = rectangle(A, Point(100, 20)).build_surface_mask()
+        self.assertEqual(mask.shape, (21, 101))
+        self.assertTrue(mask.all())
@@ -0,0 +1,111 @@
+import random
+from unittest import TestCase
+
+from skater.aabb_tree import AABBTree, overlaps, ray_box
+
+class Box:
+    def __init__(self, left, top, width, height):
+        self.left = left
+        self.top = top
+        self.right = left + width
+        self.bottom = top + height
+
+def random_boxes(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        Box(rng.randint(-500, 5000), rng.randint(-500, 2000), rng.randint(1, 300), rng.randint(1, 100))
+        for _ in range(count)]
+
+def check_tree(test, node):
+    """
+    Every internal node's box and height are fitted to its children, and the children are balanced
+    """
+    if node.is_leaf():
+        return
+    test.assertIs(node.left.parent, node)
+    test.assertIs(node.right.parent, node)
+    test.assertEqual(node.height, 1 + max(node.left.height, node.right.height))
+    test.assertLessEqual(abs(node.left.height - node.right.height), 1)
+    test.assertEqual(node.box, (
+        min(node.left.box[0], node.right.box[0]), min(node.left.box[1], node.right.box[1]),
+        max(node.left.box[2], node.right.box[2]), max(node.left.box[3], node.right.box[3])))
+    check_tree(test, node.left)
+    check_tree(test, node.right)
+
+class TestAABBTree(TestCase):
+    def setUp(self):
+        self.boxes = random_boxes(300)
+        self.tree = AABBTree()
+        for box in self.boxes:
+            self.tree.insert(box, box)
+
+    def expected(self, area):
+        return sorted(id(box) for box in self.boxes if overlaps(self.tree.fat_box(box), area))
+
+    def test_query_matches_linear_scan(self):
+        rng = random.Random(1)
+        for _ in range(100):
+            left, top = rng.randint(-600, 5100), rng.randint(-600, 2100)
+            area = (left, top, left + rng.randint(0, 500), top + rng.randint(0, 500))
+            self.assertEqual(sorted(id(box) for box in self.tree.query(*area)), self.expected(area))
+
+    def test_tree_is_balanced(self):
+        check_tree(self, self.tree.root)
+        # a perfectly balanced tree of 300 leaves is 9 levels high
+        self.assertLessEqual(self.tree.height(), 12)
+
+    def test_remove(self):
+        for box in self.boxes[::2]:
+            self.tree.remove(box)
+        self.boxes = self.boxes[1::2]
+
+        self.assertEqual(len(self.tree), 150)
+        check_tree(self, self.tree.root)
+        self.assertEqual(self.expected((-1000, -1000, 6000, 3000)), sorted(id(box) for box in self.tree.query(-1000, -1000, 6000, 3000)))
+
+    def test_small_moves_stay_in_the_fat_box(self):
+        box = self.boxes[0]
+        box.left += 3
+        box.right += 3
+        self.assertFalse(self.tree.move(box, box, (3, 0)))
+
+    def test_leaving_the_fat_box_reinserts(self):
+        box = self.boxes[0]
+        box.left += 1000
+        box.right += 1000
+        self.assertTrue(self.tree.move(box, box, (1000, 0)))
+        check_tree(self, self.tree.root)
+        self.assertIn(box, self.tree.query(box.left, box.top, box.right, box.bottom))
+
+        # stretched in the direction of the movement
+        fat_box = self.tree.fat_box(box)
+        self.assertGreater(fat_box[2] - box.right, box.left - fat_box[0])
+
+    def test_ray_cast_matches_linear_scan(self):
+        rng = random.Random(2)
+        for _ in range(100):
+            start = (rng.randint(-600, 5100), rng.randint(-600, 2100))
+            end = (start[0] + rng.randint(-1000, 1000), start[1] + rng.randint(-300, 300))
+            expected = sorted(
+                (ray_box(start, end, self.tree.fat_box(box)), id(box))
+                for box in self.boxes if ray_box(start, end, self.tree.fat_box(box)) is not None)
+            hits = self.tree.ray_cast(start, end)
+            self.assertEqual(sorted((fraction, id(box)) for fraction, box in hits), expected)
+            self.assertEqual([fraction for fraction, _ in hits], sorted(fraction for fraction, _ in hits))
+
+    def test_empty_tree(self):
+        tree = AABBTree()
+        self.assertEqual(tree.query(0, 0, 100, 100), [])
+        self.assertEqual(tree.ray_cast((0, 0), (100, 100)), [])
+        self.assertEqual(tree.height(), -1)
+
+class TestRayBox(TestCase):
+    def test_hit(self):
+        self.assertEqual(ray_box((0, 5), (20, 5), (10, 0, 15, 10)), 0.5)
+
+    def test_miss(self):
+        self.assertIsNone(ray_box((0, 20), (20, 20), (10, 0, 15, 10)))
+        self.assertIsNone(ray_box((0, 5), (5, 5), (10, 0, 15, 10)))
+
+    def test_start_inside(self):
+        self.assertEqual(ray_box((12, 5), (20, 5), (10, 0, 15, 10)), 0)
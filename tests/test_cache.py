@@ -0,0 +1,29 @@
+from unittest import TestCase
+
+from skater.cache import LRUCache
+
+class TestLRUCache(TestCase):
+    def test_get_builds_missing_value(self):
+        cache = LRUCache()
+        self.assertEqual(
+            cache.get("a", lambda: 1),
+            1)
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+
+    def test_get_reuses_stored_value(self):
+        cache = LRUCache()
+        cache.get("a", lambda: 1)
+        self.assertEqual(
+            cache.get("a", lambda: 2),
+            1)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(capacity=2)
+        cache.get("a", lambda: 1)
+        cache.get("b", lambda: 2)
+        cache.get("a", lambda: 1)  # "b" is now the least recently used
+        cache.get("c", lambda: 3)
+        self.assertIn("a", cache)
+        self.assertNotIn("b", cache)
+        self.assertEqual(len(cache), 2)
@@ -52,4 +52,14 @@ class TestAdjustY(TestCase):
         camera = Camera()
         player = base_player.shifted(y_shift=-screen_height)
         camera.adjust_y(screen, player)
-        self.assertLess(camera.y, 0)
\ No newline at end of file
+        self.assertLess(camera.y, 0)
+
+class TestViewport(TestCase):
+    def test_covers_the_screen_at_camera_position(self):
+        camera = Camera()
+        camera.x = 100
+        camera.y = -50
+        viewport = camera.viewport(screen)
+        self.assertEqual(
+            (viewport.left, viewport.top, viewport.right, viewport.bottom),
+            (100, -50, 100 + screen_width, -50 + screen_height))
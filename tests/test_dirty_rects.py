@@ -0,0 +1,72 @@
+import pygame
+from unittest import TestCase
+
+from skater.dirty_rects import DirtyRects
+
+class TestUpdateDisplay(TestCase):
+    def setUp(self):
+        pygame.display.set_mode((1280, 720))
+        self.dirty_rects = DirtyRects(enabled=True)
+
+        # the very first frame always updates the whole window
+        self.dirty_rects.update_display()
+
+    def test_updates_current_and_previous_regions(self):
+        first = pygame.Rect(0, 0, 10, 10)
+        second = pygame.Rect(5, 5, 10, 10)
+
+        self.dirty_rects.add(first)
+        self.assertEqual(self.dirty_rects.update_display(), [first])
+
+        self.dirty_rects.add(second)
+        self.assertEqual(self.dirty_rects.update_display(), [first, second])
+
+    def test_invalidate_updates_the_whole_window(self):
+        self.dirty_rects.add(pygame.Rect(0, 0, 10, 10))
+        self.dirty_rects.invalidate()
+        self.assertIsNone(self.dirty_rects.update_display())
+
+    def test_invalidate_a_region(self):
+        rect = pygame.Rect(0, 0, 10, 10)
+        self.dirty_rects.invalidate(rect)
+        self.assertEqual(self.dirty_rects.update_display(), [rect])
+        self.assertEqual(self.dirty_rects.update_display(), [])
+
+    def test_overlay_is_drawn_into_the_frame(self):
+        area = pygame.Rect(0, 0, 360, 100)
+        self.dirty_rects.overlay = lambda screen: screen.fill((255, 255, 255), area)
+        self.assertEqual(self.dirty_rects.update_display(), [area])
+        self.assertEqual(self.dirty_rects.update_display(), [area])
+        self.assertEqual(self.dirty_rects.overlay_area, area)
+
+    def test_disabled_updates_the_whole_window(self):
+        self.dirty_rects.enabled = False
+        self.dirty_rects.add(pygame.Rect(0, 0, 10, 10))
+        self.assertIsNone(self.dirty_rects.update_display())
+
+class TestDraw(TestCase):
+    def setUp(self):
+        pygame.display.set_mode((1280, 720))
+        self.dirty_rects = DirtyRects(enabled=True)
+        self.dirty_rects.update_display()
+
+        self.rect = pygame.Rect(0, 0, 10, 10)
+        self.dirty_rects.draw("player", self.rect, "standing")
+        self.dirty_rects.update_display()
+
+    def test_unchanged_sprite_is_not_pushed(self):
+        self.dirty_rects.draw("player", self.rect, "standing")
+        self.assertEqual(self.dirty_rects.update_display(), [])
+
+    def test_moved_sprite_pushes_both_regions(self):
+        moved = pygame.Rect(5, 0, 10, 10)
+        self.dirty_rects.draw("player", moved, "standing")
+        self.assertEqual(self.dirty_rects.update_display(), [moved, self.rect])
+
+    def test_changed_content_is_pushed(self):
+        self.dirty_rects.draw("player", self.rect, "crashed")
+        self.assertEqual(self.dirty_rects.update_display(), [self.rect, self.rect])
+
+    def test_vanished_sprite_leaves_its_region(self):
+        self.assertEqual(self.dirty_rects.update_display(), [self.rect])
+        self.assertEqual(self.dirty_rects.update_display(), [])
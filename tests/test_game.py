@@ -0,0 +1,78 @@
+from itertools import repeat
+
+import pygame
+from unittest import TestCase
+
+from skater.game import Game
+from skater.input_dispatcher import EventBatch
+from skater.simulation import InputState
+
+NO_EVENT = EventBatch()
+RIGHT = InputState([pygame.K_RIGHT])
+
+class FakeClock:
+    def __init__(self):
+        self.time = 0
+
+    def __call__(self):
+        return self.time
+
+class TestFixedTimestep(TestCase):
+    def setUp(self):
+        # the game only needs the size of the screen
+        self.screen = pygame.Surface((1280, 720))
+
+    def new_game(self, clock, input_state=InputState()):
+        """
+        A game with scripted input - `input_state` every tick - instead of the keyboard
+        """
+        game = Game(clock=clock)
+        game.replay = repeat(input_state)
+        return game
+
+    def run_frames(self, frame_time, frames):
+        clock = FakeClock()
+        game = self.new_game(clock)
+        for _ in range(frames):
+            game.run(self.screen, NO_EVENT)
+            clock.time += frame_time
+        return game
+
+    def test_simulation_does_not_depend_on_frame_rate(self):
+        # the same amount of time, rendered at 90 / 30 FPS
+        fast = self.run_frames(Game.TICK, 91)
+        slow = self.run_frames(3 * Game.TICK, 31)
+        self.assertEqual(
+            fast.current_positions(),
+            slow.current_positions())
+
+    def test_held_keys_do_not_depend_on_frame_rate(self):
+        # holding the right arrow for the same time (and half a tick), rendered at 144 / 30 FPS
+        positions = []
+        for fps in (144, 30):
+            clock = FakeClock()
+            game = self.new_game(clock, RIGHT)
+            for frame in range(fps + 1):
+                clock.time = frame / fps
+                game.run(self.screen, NO_EVENT)
+            clock.time = 1 + Game.TICK / 2
+            game.run(self.screen, NO_EVENT)
+
+            self.assertEqual(game.ticks, 91)
+            positions.append(game.current_positions())
+
+        self.assertGreater(positions[0][0], 100)
+        self.assertEqual(positions[0], positions[1])
+
+    def test_interpolates_between_ticks(self):
+        game = self.run_frames(Game.TICK / 2, 20)
+        self.assertGreaterEqual(game.interpolation, 0)
+        self.assertLess(game.interpolation, 1)
+
+    def test_slow_frame_is_capped(self):
+        clock = FakeClock()
+        game = self.new_game(clock)
+        game.run(self.screen, NO_EVENT)
+        clock.time += 100
+        game.run(self.screen, NO_EVENT)
+        self.assertLess(game.accumulator, Game.TICK)
@@ -0,0 +1,280 @@
+import random
+from unittest import TestCase
+
+import pygame
+
+from skater.gameboard import GameBoard, sweep_box
+from skater.obstacles import LineObstacle, MovingObstacle, Obstacle
+from skater.image import Image
+from skater.rendering.point import Point
+from skater.rendering.shape import rectangle
+
+class FakePlayer:
+    """
+    GameBoard only needs the player's `rect`
+    """
+    def __init__(self, x, y):
+        self.rect = Image.create((20, 40), (0, 0, 0)).shape
+        self.rect.x = x
+        self.rect.y = y
+
+def random_obstacles(count, seed=0):
+    rng = random.Random(seed)
+    return [
+        Obstacle(
+            Image.create((rng.randint(5, 400), rng.randint(5, 100)), (0, 0, 0)),
+            x = rng.randint(-500, 2000),
+            y = rng.randint(-200, 1000))
+        for _ in range(count)]
+
+class TestSpatialIndex(TestCase):
+    """
+    The indexed queries have to return exactly what a linear scan over all obstacles does
+    """
+    def setUp(self):
+        self.gameboard = GameBoard(random_obstacles(60))
+        rng = random.Random(1)
+        self.players = [
+            FakePlayer(rng.randint(-600, 2100), rng.randint(-300, 1100))
+            for _ in range(40)]
+
+    def test_obstacles_under_matches_linear_scan(self):
+        for player in self.players:
+            expected = [o for o in self.gameboard.obstacles if o.is_under(player.rect)]
+            self.assertEqual(self.gameboard.obstacles_under(player), expected)
+
+    def test_obstacles_right_matches_linear_scan(self):
+        for player in self.players:
+            expected = [o for o in self.gameboard.obstacles if o.is_to_the_right(player.rect)]
+            self.assertEqual(self.gameboard.obstacles_right(player), expected)
+
+    def test_obstacles_left_matches_linear_scan(self):
+        for player in self.players:
+            expected = [o for o in self.gameboard.obstacles if o.is_to_the_left(player.rect)]
+            self.assertEqual(self.gameboard.obstacles_left(player), expected)
+
+    def test_empty_gameboard_has_no_limits(self):
+        gameboard = GameBoard([])
+        player = self.players[0]
+        self.assertEqual(gameboard.limit_under(player), GameBoard.MAX_POSITION)
+        self.assertEqual(gameboard.limit_right(player), GameBoard.MAX_POSITION)
+        self.assertEqual(gameboard.limit_left(player), GameBoard.MIN_POSITION)
+
+class TestUpdateObstacles(TestCase):
+    def test_matches_a_rebuilt_gameboard(self):
+        obstacles = random_obstacles(80, seed=6)
+        gameboard = GameBoard(obstacles[:50])
+        gameboard.update_obstacles(added=obstacles[50:], removed=obstacles[:40])
+        gameboard.update_obstacles(removed=obstacles[60:70])
+        self.assertEqual(len(gameboard.index), 30)
+
+        rebuilt = GameBoard(obstacles[40:60] + obstacles[70:])
+        self.assertEqual(gameboard.obstacles, rebuilt.obstacles)
+
+        rng = random.Random(7)
+        for _ in range(40):
+            player = FakePlayer(rng.randint(-600, 2100), rng.randint(-300, 1100))
+            self.assertEqual(gameboard.obstacles_under(player), rebuilt.obstacles_under(player))
+            self.assertEqual(gameboard.obstacles_right(player), rebuilt.obstacles_right(player))
+            self.assertEqual(gameboard.obstacles_left(player), rebuilt.obstacles_left(player))
+
+    def test_index_shrinks_after_removals(self):
+        obstacles = random_obstacles(20, seed=8)
+        gameboard = GameBoard(obstacles)
+        gameboard.update_obstacles(removed=obstacles)
+        self.assertEqual(gameboard.index.items, [])
+        self.assertEqual(gameboard.index.columns, (0, -1))
+
+class TestLines(TestCase):
+    def setUp(self):
+        # a ramp going up to the right, from (0, 600) to (1000, 400)
+        self.ramp = LineObstacle(Point(0, 600), Point(1000, 400))
+        self.gameboard = GameBoard([], lines=[self.ramp])
+
+    def test_limit_under_reaches_the_ramp(self):
+        player = FakePlayer(480, 300)  # x 480 - 500, bottom 340
+        self.assertEqual(self.gameboard.limit_under(player), 500 - 340)
+
+    def test_player_in_the_ramp_is_lifted_onto_it(self):
+        player = FakePlayer(500, 465)  # x 500 - 520, bottom 505, the ramp is at 496 at x 520
+        self.assertEqual(self.gameboard.limit_under(player), -9)
+
+    def test_ramp_high_above_the_feet_is_ignored(self):
+        player = FakePlayer(500, 560)  # bottom 600, the ramp is 100 px higher
+        self.assertEqual(self.gameboard.limit_under(player), GameBoard.MAX_POSITION)
+
+    def test_lines_are_kept_apart_from_other_obstacles(self):
+        floor = Obstacle(Image.create((1000, 50), (0, 0, 0)), x = 0, y = 700)
+        gameboard = GameBoard([])
+        gameboard.update_obstacles(added=[floor, self.ramp])
+        self.assertEqual(gameboard.obstacles, [floor])
+        self.assertEqual(gameboard.lines, [self.ramp])
+
+        gameboard.update_obstacles(removed=[self.ramp])
+        self.assertEqual(gameboard.lines, [])
+
+class TestSweep(TestCase):
+    def setUp(self):
+        self.floor = Obstacle(Image.create((1000, 50), (0, 0, 0)), x = 0, y = 600)
+        self.wall = Obstacle(Image.create((2, 400), (0, 0, 0)), x = 500, y = 200)  # a thin one
+        self.gameboard = GameBoard([self.floor, self.wall])
+
+    def test_free_path(self):
+        self.assertIsNone(self.gameboard.sweep(FakePlayer(100, 100), (10, 10)))
+
+    def test_lands_on_floor(self):
+        player = FakePlayer(100, 540)  # bottom 580
+        contact = self.gameboard.sweep(player, (10, 40))
+        self.assertEqual((contact.time, contact.normal, contact.obstacle), (0.5, (0, -1), self.floor))
+
+    def test_fast_player_does_not_tunnel_through_a_thin_wall(self):
+        player = FakePlayer(300, 400)  # x 300 - 320
+        contact = self.gameboard.sweep(player, (1000, 0))
+        self.assertEqual((contact.normal, contact.obstacle), ((-1, 0), self.wall))
+        # stops 1 pixel before the wall, like `limit_right`
+        self.assertEqual(player.rect.right + 1000 * contact.time, self.wall.rect.left - 1)
+
+    def test_floor_is_passed_through_from_below(self):
+        self.assertIsNone(self.gameboard.sweep(FakePlayer(100, 660), (0, -100)))
+
+    def test_overlapped_obstacle_is_ignored(self):
+        self.assertIsNone(sweep_box(FakePlayer(100, 590).rect, (0, 600, 1000, 650), 5, 5))
+
+    def test_standing_player_is_stopped_at_once(self):
+        player = FakePlayer(100, 560)  # bottom 600
+        contact = self.gameboard.sweep(player, (8, 3.6))
+        self.assertEqual((contact.time, contact.normal), (0, (0, -1)))
+
+    def test_falls_past_the_edge(self):
+        # the player's left side is exactly on the floor's right one - not standing on it, like `limit_under`
+        player = FakePlayer(1000, 560)
+        self.assertIsNone(self.gameboard.sweep(player, (0, 3.6)))
+        self.assertEqual(self.gameboard.limit_under(player), GameBoard.MAX_POSITION)
+
+    def test_touched_top_is_in_the_way_sideways(self):
+        # like `limit_right`, a platform at the height of the player's feet stops them
+        step = Obstacle(Image.create((100, 50), (0, 0, 0)), x = 100, y = 400)
+        gameboard = GameBoard([step])
+        player = FakePlayer(0, 360)  # bottom 400
+        contact = gameboard.sweep(player, (100, 0))
+        self.assertEqual(player.rect.right + 100 * contact.time, step.rect.left - 1)
+        self.assertEqual(gameboard.limit_right(player), 100 * contact.time)
+
+    def test_sunk_limit(self):
+        self.assertEqual(self.gameboard.sunk_limit(FakePlayer(100, 566)), -6)
+        self.assertEqual(self.gameboard.sunk_limit(FakePlayer(100, 560)), GameBoard.MAX_POSITION)
+
+class TestMovingObstacles(TestCase):
+    def setUp(self):
+        self.platform = MovingObstacle(Image.create((100, 10), (0, 0, 0)), x = 0, y = 600, end = Point(300, 600), speed = 5)
+        self.wall = MovingObstacle(Image.create((10, 100), (0, 0, 0)), x = 500, y = 500, end = Point(500, 0), speed = 4)
+        self.gameboard = GameBoard(random_obstacles(60), moving=[self.platform, self.wall])
+
+    def test_limits_include_moving_obstacles(self):
+        gameboard = GameBoard([], moving=[self.platform, self.wall])
+        player = FakePlayer(20, 500)  # bottom 540, right 40
+        self.assertEqual(gameboard.limit_under(player), 60)
+        self.assertEqual(gameboard.limit_right(player), 459)
+        self.assertEqual(gameboard.obstacles_under(player), [self.platform])
+
+    def test_tree_follows_the_obstacles(self):
+        for _ in range(200):
+            self.gameboard.update_moving()
+            for obstacle in (self.platform, self.wall):
+                rect = obstacle.rect
+                self.assertIn(obstacle, self.gameboard.tree.query(rect.left, rect.top, rect.right, rect.bottom))
+
+    def test_small_moves_keep_the_tree(self):
+        leaf = self.gameboard.tree.leaves[id(self.platform)]
+        box = leaf.box
+        self.gameboard.update_moving()
+        self.assertIs(self.gameboard.tree.leaves[id(self.platform)].box, box)
+
+    def test_rider_is_carried(self):
+        player = FakePlayer(20, 560)  # standing on the platform
+        self.gameboard.update_moving(riders=[player])
+        self.assertEqual((player.rect.x, player.rect.bottom), (25, 600))
+
+    def test_update_obstacles_sorts_moving_ones_out(self):
+        gameboard = GameBoard([])
+        gameboard.update_obstacles(added=[self.platform])
+        self.assertEqual((gameboard.obstacles, gameboard.moving), ([], [self.platform]))
+        gameboard.update_obstacles(removed=[self.platform])
+        self.assertEqual((gameboard.moving, len(gameboard.tree)), ([], 0))
+
+    def test_ray_cast(self):
+        fraction, obstacle = self.gameboard.ray_cast((400, 550), (600, 550))
+        self.assertEqual((fraction, obstacle), (0.5, self.wall))
+
+def overlaps(rect, other):
+    return rect.left <= other.right and rect.right >= other.left \
+        and rect.top <= other.bottom and rect.bottom >= other.top
+
+class FakeSprite:
+    """
+    The pixel collisions need the player's `image` too
+    """
+    def __init__(self, x, y):
+        self.image = Image.create((20, 40), (0, 0, 0))
+        self.rect = self.image.shape
+        self.rect.x = x
+        self.rect.y = y
+
+class TestPixelCollision(TestCase):
+    def setUp(self):
+        self.obstacles = random_obstacles(60)
+        self.pixels = GameBoard(self.obstacles, pixel_collision=True)
+        self.shapes = GameBoard(self.obstacles)
+        rng = random.Random(1)
+        self.players = [
+            FakeSprite(rng.randint(-600, 2100), rng.randint(-300, 1100))
+            for _ in range(80)]
+
+        # shapes and pixels only agree on how to get out of an obstacle for the floors
+        self.players = [
+            player for player in self.players
+            if not any(overlaps(obstacle.rect, player.rect) for obstacle in self.obstacles)]
+
+    def test_sweeps_match_shapes_downwards(self):
+        for player in self.players:
+            by_shapes = self.shapes.sweep(player, (0, 2000))
+            by_pixels = self.pixels.sweep(player, (0, 2000))
+            if by_shapes is None:
+                self.assertIsNone(by_pixels)
+                continue
+
+            # pixels stop 1 pixel before the obstacles' tops too
+            self.assertEqual(round(2000 * by_pixels.time), round(2000 * by_shapes.time) - 1)
+            self.assertEqual(by_pixels.obstacle.rect.y, by_shapes.obstacle.rect.y)
+
+    def test_sweeps_match_shapes_sideways(self):
+        for player in self.players:
+            for displacement in [(300, 0), (-300, 0)]:
+                by_shapes = self.shapes.sweep(player, displacement)
+                by_pixels = self.pixels.sweep(player, displacement)
+                self.assertEqual(
+                    by_pixels and (by_pixels.time, by_pixels.obstacle.rect.x),
+                    by_shapes and (by_shapes.time, by_shapes.obstacle.rect.x))
+
+    def test_triangle(self):
+        # a ramp going down to the right: the top is 1 pixel lower with every column
+        surface = pygame.Surface((101, 101), flags=pygame.SRCALPHA)
+        pygame.draw.polygon(surface, (0, 0, 0), [(0, 0), (100, 100), (0, 100)])
+        ramp = Obstacle(Image(surface, rectangle(Point(0, 0), Point(100, 100))), x = 0, y = 500)
+        gameboard = GameBoard([ramp], pixel_collision=True)
+
+        player = FakeSprite(40, 0)  # columns 40 - 60, bottom 40
+        self.assertEqual(round(1000 * gameboard.sweep(player, (0, 1000)).time), 500 + 40 - 40 - 1)
+
+    def test_lands_on_the_floor_under_a_roof(self):
+        # a bracket: a roof and a floor 10 pixels thick, joined on the left
+        surface = pygame.Surface((61, 111), flags=pygame.SRCALPHA)
+        surface.fill((0, 0, 0), (0, 0, 61, 11))
+        surface.fill((0, 0, 0), (0, 100, 61, 11))
+        surface.fill((0, 0, 0), (0, 0, 11, 111))
+        bracket = Obstacle(Image(surface, rectangle(Point(0, 0), Point(60, 110))), x = 0, y = 500)
+        gameboard = GameBoard([bracket], pixel_collision=True)
+
+        player = FakeSprite(20, 520)  # bottom row 560, the floor's top 600
+        self.assertIsNone(gameboard.sweep(player, (0, 8)))
+        self.assertEqual(round(40 * gameboard.sweep(player, (0, 40)).time), 39)
@@ -2,6 +2,7 @@ import pygame
 from unittest import TestCase
 
 from skater.image import Image
+from skater import image_paths
 
 class TestCreate(TestCase):
     def test_creates_a_rectangle_of_correct_size(self):
@@ -12,4 +13,29 @@ class TestCreate(TestCase):
 
         self.assertEqual(
             (got.shape.width, got.shape.height),
-            shape)
\ No newline at end of file
+            shape)
+
+    def test_surface_fits_the_shape(self):
+        got = Image.create((2000, 50), (0, 0, 0))
+
+        # borders are drawn, hence the extra pixel
+        self.assertEqual(
+            got.raw_image.get_size(),
+            (2001, 51))
+
+class TestLoad(TestCase):
+    def setUp(self):
+        pygame.display.set_mode((1280, 720))  # FIXME: decouple Image from pygame.display
+        Image.surface_cache.clear()
+
+    def test_reuses_decoded_surface(self):
+        first = Image.load(image_paths.PLAYER_MAIN)
+        second = Image.load(image_paths.PLAYER_MAIN)
+        self.assertIs(first.raw_image, second.raw_image)
+        self.assertEqual(Image.surface_cache.hits, 1)
+
+    def test_returns_a_fresh_shape(self):
+        first = Image.load(image_paths.PLAYER_MAIN)
+        first.shape.x = 100
+        second = Image.load(image_paths.PLAYER_MAIN)
+        self.assertEqual(second.shape.x, 0)
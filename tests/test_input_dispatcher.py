@@ -0,0 +1,41 @@
+import pygame
+from unittest import TestCase
+
+from skater.input_dispatcher import EventBatch, InputDispatcher
+from skater.menu import Menu
+
+def key_event(event_type, key):
+    return pygame.event.Event(event_type, key=key)
+
+class TestInputDispatcher(TestCase):
+    def setUp(self):
+        pygame.display.set_mode((100, 100))
+        pygame.event.clear()
+
+    def test_drains_the_queue_in_order(self):
+        events = [key_event(pygame.KEYDOWN, pygame.K_SPACE), key_event(pygame.KEYUP, pygame.K_SPACE)]
+        for event in events:
+            pygame.event.post(event)
+
+        batch = InputDispatcher(clock=lambda: 1.5).poll()
+        keys = [(event.type, event.key) for event in batch if event.type in (pygame.KEYDOWN, pygame.KEYUP)]
+        self.assertEqual(keys, [(pygame.KEYDOWN, pygame.K_SPACE), (pygame.KEYUP, pygame.K_SPACE)])
+        self.assertTrue(all(timestamp == 1.5 for timestamp, _ in batch.timed()))
+        self.assertEqual(len(InputDispatcher().poll()), 0)
+
+class TestEventBatch(TestCase):
+    def test_key_pressed(self):
+        batch = EventBatch([key_event(pygame.KEYUP, pygame.K_q), key_event(pygame.KEYDOWN, pygame.K_y)])
+        self.assertTrue(batch.key_pressed([pygame.K_y]))
+        self.assertFalse(batch.key_pressed([pygame.K_q]))
+
+    def test_extend_keeps_the_order(self):
+        batch = EventBatch([key_event(pygame.KEYDOWN, pygame.K_a)], [1])
+        batch.extend(EventBatch([key_event(pygame.KEYDOWN, pygame.K_b)], [2]))
+        self.assertEqual([(timestamp, event.key) for timestamp, event in batch.timed()], [(1, pygame.K_a), (2, pygame.K_b)])
+
+class TestMenu(TestCase):
+    def test_handles_every_event_of_a_frame(self):
+        menu = Menu()
+        menu.run(None, EventBatch([key_event(pygame.KEYDOWN, pygame.K_DOWN), key_event(pygame.KEYDOWN, pygame.K_RETURN)]))
+        self.assertEqual(menu.active_state, "Controls")
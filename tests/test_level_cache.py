@@ -0,0 +1,92 @@
+import os
+import tempfile
+import pygame
+from unittest import TestCase
+
+from skater.game import Game
+from skater.gameboard import GameBoard
+from skater.level_cache import LevelCache
+from skater.obstacles_list import OBSTACLES
+from skater.rendering.point import Point
+from skater.rendering.shape import rectangle
+from skater.simulation import InputState, Simulation
+
+class TestLevelCache(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "level.levelcache")
+
+    def test_loads_what_was_compiled(self):
+        compiled = LevelCache.load_or_compile(OBSTACLES, self.path)
+        loaded = LevelCache.load(self.path)
+
+        self.assertEqual(len(loaded.obstacles), len(compiled.obstacles))
+        for original, cached in zip(compiled.obstacles, loaded.obstacles):
+            self.assertEqual(type(cached.rect), type(original.rect))
+            self.assertEqual(cached.rect.points.tolist(), original.rect.points.tolist())
+            self.assertEqual(
+                pygame.image.tobytes(cached.image.raw_image, "RGBA"),
+                pygame.image.tobytes(original.image.raw_image, "RGBA"))
+
+        self.assertEqual(len(loaded.lines), 1)
+        self.assertEqual(loaded.lines[0].edge, compiled.lines[0].edge)
+        self.assertEqual(loaded.lines[0].rect.points.tolist(), compiled.lines[0].rect.points.tolist())
+
+        self.assertEqual(loaded.index.cells, compiled.index.cells)
+        self.assertEqual((loaded.index.columns, loaded.index.rows), (compiled.index.columns, compiled.index.rows))
+
+    def test_loads_moving_obstacles(self):
+        mover = {'type': 3, 'position': {'x': 50, 'y': 520}, 'size': {'width': 200, 'height': 20},
+                 'end_position': {'x': 650, 'y': 500}, 'speed': 2.5}
+        compiled = LevelCache.load_or_compile(dict(OBSTACLES, M_01=mover), self.path)
+        compiled.moving[0].update()
+        loaded = LevelCache.load(self.path)
+
+        self.assertEqual(len(loaded.obstacles), len(compiled.obstacles))
+        platform, = loaded.moving
+        self.assertEqual(platform.rect.points.tolist(), rectangle(Point(50, 520), Point(250, 540)).points.tolist())
+        self.assertEqual((platform.end, platform.speed), (Point(650, 500), 2.5))
+
+    def test_is_reused_until_the_level_changes(self):
+        LevelCache.load_or_compile(OBSTACLES, self.path)
+        modified = os.path.getmtime(self.path)
+        os.utime(self.path, (0, 0))
+
+        LevelCache.load_or_compile(OBSTACLES, self.path)
+        self.assertEqual(os.path.getmtime(self.path), 0)
+
+        changed = dict(OBSTACLES, P_08={'type': 1, 'position': {'x': 0, 'y': 0}, 'size': {'width': 10, 'height': 10}})
+        level = LevelCache.load_or_compile(changed, self.path)
+        self.assertNotEqual(os.path.getmtime(self.path), 0)
+        self.assertEqual(len(level.obstacles), len(LevelCache.load(self.path).obstacles))
+
+    def test_creates_the_cache_directory(self):
+        path = os.path.join(os.path.dirname(self.path), "skater", "level.levelcache")
+        LevelCache.load_or_compile(OBSTACLES, path)
+        self.assertTrue(os.path.exists(path))
+
+    def test_recompiles_a_broken_cache(self):
+        with open(self.path, "wb") as cache_file:
+            cache_file.write(b"garbage")
+        level = LevelCache.load_or_compile(OBSTACLES, self.path)
+        self.assertEqual(len(LevelCache.load(self.path).obstacles), len(level.obstacles))
+
+    def test_cached_index_can_be_updated(self):
+        LevelCache.load_or_compile(OBSTACLES, self.path)
+        level = LevelCache.load(self.path)
+        gameboard = GameBoard([])
+        gameboard.set_obstacles(level.obstacles, level.index)
+        gameboard.update_obstacles(removed=level.obstacles[:3])
+        self.assertEqual(gameboard.obstacles, level.obstacles[3:])
+
+    def test_game_plays_the_same_from_the_cache(self):
+        positions = []
+        for _ in range(2):
+            game = Game(level_cache_path=self.path)
+            simulation = Simulation(game)
+            simulation.run_for(200, InputState([pygame.K_RIGHT]))
+            positions.append(game.current_positions())
+
+        self.assertTrue(os.path.exists(self.path))
+        self.assertEqual(positions[0], positions[1])
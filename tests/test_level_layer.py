@@ -0,0 +1,62 @@
+import pygame
+from unittest import TestCase
+
+from skater.camera import Camera
+from skater.dirty_rects import dirty_rects
+from skater.image import Image
+from skater.level_layer import LevelLayer
+from skater.obstacles import MovingObstacle, Obstacle
+from skater.rendering.point import Point
+
+RED = (255, 0, 0)
+
+class TestLevelLayer(TestCase):
+    def setUp(self):
+        # spans the first two chunks horizontally
+        self.obstacle = Obstacle(Image.create((100, 50), RED), x = 450, y = 20)
+        self.layer = LevelLayer([self.obstacle], chunk_size=512)
+
+    def test_bakes_obstacles_into_chunks(self):
+        chunk = self.layer.chunk(0, 0)
+        self.assertEqual(chunk.get_at((450, 20))[:3], RED)
+        self.assertEqual(chunk.get_at((449, 20))[3], 0)
+
+    def test_obstacle_continues_in_the_next_chunk(self):
+        chunk = self.layer.chunk(1, 0)
+        self.assertEqual(chunk.get_at((0, 20))[:3], RED)
+
+    def test_empty_chunk_is_not_baked(self):
+        self.assertIsNone(self.layer.chunk(5, 5))
+
+    def test_chunks_are_evicted_under_memory_cap(self):
+        layer = LevelLayer([self.obstacle], chunk_size=512, max_bytes=2 * 4 * 512 ** 2)
+        layer.chunk(0, 0)
+        layer.chunk(1, 0)
+        layer.chunk(2, 0)
+        self.assertEqual(len(layer.chunks), 2)
+        self.assertNotIn((0, 0), layer.chunks)
+
+    def test_update_obstacles_rebakes_the_chunks(self):
+        self.layer.chunk(0, 0)
+        self.layer.update_obstacles(removed=[self.obstacle])
+        self.assertNotIn((0, 0), self.layer.chunks)
+        self.assertIsNone(self.layer.chunk(0, 0))
+
+    def test_moving_obstacles_are_not_baked(self):
+        platform = MovingObstacle(Image.create((100, 10), RED), x = 600, y = 20, end = Point(900, 20))
+        layer = LevelLayer([platform], chunk_size=512)
+        layer.update_obstacles(added=[platform])
+        self.assertIsNone(layer.chunk(1, 0))
+
+    def test_static_chunks_are_not_pushed_to_the_window(self):
+        screen = pygame.display.set_mode((1280, 720))
+        camera = Camera()
+        dirty_rects.update_display()
+
+        self.layer.draw(screen, camera)
+        self.assertEqual(dirty_rects.current, [])
+
+        self.layer.update_obstacles(removed=[self.obstacle])
+        self.layer.draw(screen, camera)
+        self.assertEqual(dirty_rects.current, [pygame.Rect(0, 0, 512, 512), pygame.Rect(512, 0, 512, 512)])
+        dirty_rects.update_display()
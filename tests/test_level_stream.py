@@ -0,0 +1,138 @@
+import os
+import tempfile
+import pygame
+from unittest import TestCase
+
+from skater.game import Game
+from skater.gameboard import GameBoard
+from skater.level_layer import LevelLayer
+from skater.level_stream import LevelFile, LevelStreamer
+from skater.obstacles_list import OBSTACLES
+from skater.rendering.point import Point
+from skater.rendering.shape import rectangle
+from skater.simulation import InputState, Simulation
+
+def long_level(count):
+    """
+    `count` platforms in a row, 500 px apart
+    """
+    return {
+        "P_{}".format(i): {'type': 1, 'position': {'x': 500 * i, 'y': 600}, 'size': {'width': 300, 'height': 50}}
+        for i in range(count)}
+
+# a platform under the player's starting position, travelling 600 px to the right and back
+MOVER = {'type': 3, 'position': {'x': 50, 'y': 520}, 'size': {'width': 200, 'height': 20},
+         'end_position': {'x': 650, 'y': 520}, 'speed': 2}
+
+def viewport(x, y=0):
+    return rectangle(Point(x, y), Point(x + 1280, y + 720))
+
+class LevelFileTestCase(TestCase):
+    def write(self, definitions, chunk_size=LevelFile.CHUNK_SIZE):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "level.skl")
+        LevelFile.write(path, definitions, chunk_size)
+        return path
+
+    def open(self, path):
+        level_file = LevelFile(path)
+        self.addCleanup(level_file.close)
+        return level_file
+
+class TestLevelFile(LevelFileTestCase):
+    def test_obstacle_is_stored_in_every_chunk_it_overlaps(self):
+        level_file = self.open(self.write({"P_01": OBSTACLES["P_01"]}, chunk_size=256))
+        # x 0 - 300, y 600 - 650
+        self.assertEqual(sorted(level_file.chunks), [(0, 2), (1, 2)])
+        self.assertEqual(level_file.read_chunk(1, 2), {"P_01": OBSTACLES["P_01"]})
+        self.assertEqual(level_file.read_chunk(5, 5), {})
+
+    def test_moving_obstacle_is_stored_along_its_way(self):
+        level_file = self.open(self.write({"M_01": MOVER}, chunk_size=256))
+        self.assertEqual(sorted(level_file.chunks), [(0, 2), (1, 2), (2, 2), (3, 2)])
+
+    def test_rejects_other_files(self):
+        path = self.write({})
+        with open(path, "wb") as level:
+            level.write(b"not a level\n")
+        with self.assertRaises(ValueError):
+            LevelFile(path)
+
+class TestLevelStreamer(LevelFileTestCase):
+    def setUp(self):
+        self.streamer = LevelStreamer(self.open(self.write(long_level(1000), chunk_size=1024)))
+
+    def test_loads_obstacles_around_the_viewport(self):
+        added, removed = self.streamer.update(viewport(0))
+        self.assertEqual(removed, [])
+        # viewport + 1 chunk margin: x < 3 * 1024
+        self.assertEqual(len(added), len([i for i in range(1000) if 500 * i < 3 * 1024]))
+
+    def test_loads_ahead_in_the_direction_of_travel(self):
+        self.streamer.update(viewport(10000))
+        self.streamer.update(viewport(10100))
+        loaded_columns = [column for column, _ in self.streamer.loaded]
+        # viewport columns 9 - 11, one chunk behind, three ahead
+        self.assertEqual((min(loaded_columns), max(loaded_columns)), (8, 14))
+
+    def test_memory_stays_bounded(self):
+        gameboard = GameBoard([])
+        most_loaded = 0
+        for x in range(0, 490000, 700):
+            added, removed = self.streamer.update(viewport(x))
+            gameboard.update_obstacles(added, removed)
+            most_loaded = max(most_loaded, len(self.streamer.loaded))
+
+            # everything around the viewport is loaded
+            view = viewport(x)
+            self.assertTrue(all(
+                "P_{}".format(i) in self.streamer.obstacles
+                for i in range(1000) if view.left <= 500 * i <= view.right))
+
+        self.assertLessEqual(most_loaded, 3 + 2 * LevelStreamer.KEEP)
+        self.assertEqual(len(gameboard.obstacles), len(self.streamer.obstacles))
+        self.assertLess(len(gameboard.index.items), 2 * len(gameboard.obstacles) + 1)
+
+    def test_obstacle_spanning_chunks_is_loaded_once(self):
+        streamer = LevelStreamer(self.open(self.write({"P_07": OBSTACLES["P_07"]}, chunk_size=256)))
+        added, _ = streamer.update(viewport(0))
+        self.assertEqual(len(added), 1)
+
+        _, removed = streamer.update(viewport(100000))
+        self.assertEqual(len(removed), 1)
+        self.assertEqual(streamer.obstacles, {})
+
+class TestStreamedGame(LevelFileTestCase):
+    def test_plays_like_the_built_in_level(self):
+        path = self.write(OBSTACLES, chunk_size=256)
+        ollie = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+        inputs = [InputState()] * 100 + [InputState(events=[ollie])] + [InputState([pygame.K_RIGHT])] * 200
+
+        trajectories = []
+        for game in [Game(), Game(level_path=path)]:
+            simulation = Simulation(game)
+            trajectory = []
+            for input_state in inputs:
+                simulation.step(input_state)
+                trajectory.append((simulation.player.rect.x, simulation.player.rect.y))
+            trajectories.append(trajectory)
+            if game.streamer is not None:
+                game.streamer.level_file.close()
+
+        self.assertEqual(trajectories[0], trajectories[1])
+
+    def test_player_rides_a_moving_platform(self):
+        game = Game(level_path=self.write({"M_01": MOVER}, chunk_size=256))
+        self.addCleanup(lambda: game.streamer.level_file.close())
+        simulation = Simulation(game)
+        simulation.run_for(30)
+
+        platform, = game.gameboard.moving
+        self.assertEqual(len(game.level_layer.index.items), 0)
+        self.assertEqual(simulation.player.rect.bottom, platform.rect.top)
+
+        x = simulation.player.rect.x
+        simulation.run_for(100)
+        self.assertEqual(simulation.player.rect.x, x + 200)
+        self.assertEqual(simulation.player.rect.bottom, platform.rect.top)
@@ -0,0 +1,120 @@
+import random
+from math import cos, pi, sin
+from unittest import TestCase
+
+import pygame
+
+from skater.image import Image
+from skater.pixel_mask import DOWN, LEFT, RIGHT, PixelMask, first_contact
+from skater.rendering.point import Point
+from skater.rendering.shape import Polygon
+
+def polygon_surface(vertices):
+    """
+    A surface with the polygon's pixels opaque, like `Image.create` builds for rectangles
+    """
+    mask = Polygon(vertices).build_surface_mask().transpose()
+    surface = pygame.Surface(mask.shape, flags=pygame.SRCALPHA)
+    surface.fill((0, 0, 0))
+    pygame.surfarray.pixels_alpha(surface)[:] = mask * 255
+    return surface
+
+def random_polygon(rng, vertex_count):
+    # a star-shaped polygon - concave, with a lot of vertices
+    centre = 60
+    points = []
+    for i in range(vertex_count):
+        angle = 2 * pi * i / vertex_count
+        radius = rng.randint(20, 60)
+        points.append(Point(round(centre + radius * cos(angle)), round(centre + radius * sin(angle))))
+    return points
+
+def probe(mover, mover_position, target, target_position, direction):
+    """
+    `first_contact` one pixel at a time: from far behind if the masks overlap, from 1 pixel ahead otherwise
+    """
+    def overlaps(distance):
+        x = mover_position[0] + direction[0] * distance - target_position[0]
+        y = mover_position[1] + direction[1] * distance - target_position[1]
+        return target.mask.overlap(mover.mask, (x, y)) is not None
+
+    for distance in range(-400 if overlaps(0) else 1, 400):
+        if overlaps(distance):
+            return distance
+    return None
+
+class CountingMask:
+    """
+    A mask counting the overlap tests made against it
+    """
+    def __init__(self, mask):
+        self.mask = mask
+        self.overlaps = 0
+
+    def overlap(self, other, offset):
+        self.overlaps += 1
+        return self.mask.overlap(other, offset)
+
+class TestPixelMask(TestCase):
+    def test_outline(self):
+        mask = PixelMask(polygon_surface([Point(0, 0), Point(4, 0), Point(0, 4)]))
+        self.assertEqual((mask.width, mask.height), (5, 5))
+        self.assertEqual(mask.tops.tolist(), [0, 0, 0, 0, 0])
+        self.assertEqual(mask.bottoms.tolist(), [4, 3, 2, 1, 0])
+        self.assertEqual(mask.rights.tolist(), [4, 3, 2, 1, 0])
+        self.assertTrue(mask.columns.all())
+
+class TestFirstContact(TestCase):
+    def setUp(self):
+        self.mover = PixelMask(Image.create((20, 40), (0, 0, 0)).raw_image)
+        self.floor = PixelMask(Image.create((200, 20), (0, 0, 0)).raw_image)
+
+    def test_rectangles(self):
+        self.assertEqual(first_contact(self.mover, (50, 0), self.floor, (0, 100), DOWN), 60)
+        self.assertEqual(first_contact(self.mover, (-50, 70), self.floor, (0, 100), RIGHT), 30)
+        self.assertEqual(first_contact(self.mover, (250, 70), self.floor, (0, 100), LEFT), 50)
+
+    def test_missed(self):
+        self.assertIsNone(first_contact(self.mover, (300, 0), self.floor, (0, 100), DOWN))
+        self.assertIsNone(first_contact(self.mover, (50, 0), self.floor, (0, 100), RIGHT))
+
+    def test_overlapping_already(self):
+        self.assertEqual(first_contact(self.mover, (50, 70), self.floor, (0, 100), DOWN), -10)
+
+    def test_matches_probing_for_concave_shapes(self):
+        rng = random.Random(0)
+        for _ in range(20):
+            target = PixelMask(polygon_surface(random_polygon(rng, 64)))
+            mover = PixelMask(polygon_surface(random_polygon(rng, 16)))
+            for direction in (DOWN, RIGHT, LEFT):
+                mover_position = (rng.randint(-150, 150), rng.randint(-150, 150))
+                self.assertEqual(
+                    first_contact(mover, mover_position, target, (0, 0), direction),
+                    probe(mover, mover_position, target, (0, 0), direction))
+
+    def test_concave_target(self):
+        # a bracket: a roof and a floor 10 pixels thick, 90 pixels apart, joined on the left
+        bracket = PixelMask(polygon_surface([
+            Point(0, 0), Point(60, 0), Point(60, 10), Point(10, 10), Point(10, 100), Point(60, 100),
+            Point(60, 110), Point(0, 110)]))
+        bracket.mask = CountingMask(bracket.mask)
+
+        # coming from above, the outlines tell where the roof is hit - no overlap tests
+        self.assertEqual(first_contact(self.mover, (20, -100), bracket, (0, 0), DOWN), 60)
+        self.assertEqual(bracket.mask.overlaps, 0)
+
+        # under the roof, the floor is probed for - only as far as the mover gets
+        self.assertIsNone(first_contact(self.mover, (20, 20), bracket, (0, 0), DOWN, reach=8))
+        self.assertEqual(bracket.mask.overlaps, 1 + 8)
+
+        self.assertEqual(first_contact(self.mover, (20, 20), bracket, (0, 0), DOWN, reach=40), 40)
+
+class TestImageMask(TestCase):
+    def test_mask_is_cached(self):
+        image = Image.create((20, 40), (0, 0, 0))
+        self.assertIs(image.pixel_mask(), image.pixel_mask())
+
+    def test_images_sharing_a_surface_share_the_mask(self):
+        image = Image.create((20, 40), (0, 0, 0))
+        other = Image(image.raw_image, image.shape.clone())
+        self.assertIs(other.pixel_mask(), image.pixel_mask())
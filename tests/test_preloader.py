@@ -0,0 +1,51 @@
+import os
+import tempfile
+from unittest import TestCase
+
+from skater.image import Image
+from skater.menu import Menu
+from skater.obstacles_list import OBSTACLES
+from skater.player import Player
+from skater.preloader import Preloader, preloader
+
+class TestPreloader(TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.level_path = os.path.join(directory.name, "level.levelcache")
+
+        Image.surface_cache.clear()
+        self.preloader = Preloader(max_workers=2)
+        self.preloader.start(Player.IMAGES, [(OBSTACLES, self.level_path)])
+
+    def test_reports_progress(self):
+        self.preloader.levels[self.level_path].result()
+        for job in self.preloader.images.values():
+            job.result()
+        self.assertEqual(self.preloader.progress(), (len(Player.IMAGES) + 1, len(Player.IMAGES) + 1))
+
+    def test_collected_images_are_cached(self):
+        self.preloader.collect_images()
+        self.assertTrue(all(path in Image.surface_cache for path in Player.IMAGES))
+
+        Image.load(Player.IMAGES[0])
+        self.assertEqual(Image.surface_cache.hits, 1)
+        self.assertEqual(Image.surface_cache.misses, 0)
+
+    def test_cached_images_are_not_loaded_again(self):
+        self.preloader.collect_images()
+        self.preloader.start(Player.IMAGES, [])
+        self.assertEqual(self.preloader.images, {})
+
+    def test_level_is_handed_over_once(self):
+        preloaded = self.preloader.levels[self.level_path].result()
+        self.assertIs(self.preloader.load_level(OBSTACLES, self.level_path), preloaded)
+
+        loaded = self.preloader.load_level(OBSTACLES, self.level_path)
+        self.assertIsNot(loaded, preloaded)
+        self.assertEqual(len(loaded.obstacles), len(preloaded.obstacles))
+
+    def test_menu_does_not_start_loading(self):
+        Menu()
+        self.assertIsNone(preloader.executor)
+        self.assertEqual(preloader.progress(), (0, 0))
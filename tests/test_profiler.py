@@ -0,0 +1,57 @@
+import csv
+import os
+import tempfile
+from unittest import TestCase
+
+from skater.profiler import NO_PHASE, Profiler
+
+class TestProfiler(TestCase):
+    def test_disabled_records_nothing(self):
+        profiler = Profiler()
+        self.assertIs(profiler.phase("draw"), NO_PHASE)
+        profiler.count("blits")
+        profiler.end_frame()
+        self.assertEqual(len(profiler.history()), 0)
+
+    def test_records_counters_per_frame(self):
+        profiler = Profiler(enabled=True)
+        profiler.count("blits", 3)
+        profiler.end_frame()
+        profiler.count("blits")
+        profiler.end_frame()
+        blits = profiler.history()[:, profiler.columns["blits"]]
+        self.assertEqual(blits.tolist(), [3, 1])
+
+    def test_records_phase_durations(self):
+        profiler = Profiler(enabled=True)
+        with profiler.phase("draw"):
+            sum(range(1000))
+        profiler.end_frame()
+        self.assertGreater(profiler.history()[0, profiler.columns["draw"]], 0)
+
+    def test_ring_buffer_keeps_the_latest_frames_in_order(self):
+        profiler = Profiler(capacity=3, enabled=True)
+        for blits in range(5):
+            profiler.count("blits", blits)
+            profiler.end_frame()
+        blits = profiler.history()[:, profiler.columns["blits"]]
+        self.assertEqual(blits.tolist(), [2, 3, 4])
+
+    def test_percentiles(self):
+        profiler = Profiler(enabled=True)
+        for blits in range(101):
+            profiler.count("blits", blits)
+            profiler.end_frame()
+        self.assertEqual(profiler.percentiles("blits", (50, 100)), [50, 100])
+
+    def test_dump_csv(self):
+        profiler = Profiler(enabled=True)
+        profiler.end_frame()
+        profiler.end_frame()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "profile.csv")
+            profiler.dump_csv(path)
+            with open(path) as dump:
+                rows = list(csv.reader(dump))
+        self.assertEqual(rows[0], list(Profiler.PHASES + Profiler.COUNTERS))
+        self.assertEqual(len(rows), 3)
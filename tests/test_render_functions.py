@@ -0,0 +1,35 @@
+import pygame
+from unittest import TestCase
+
+from skater.render_functions import get_font, render_text, text_surfaces
+
+class TestGetFont(TestCase):
+    def setUp(self):
+        pygame.font.init()
+
+    def test_reuses_fonts(self):
+        self.assertIs(
+            get_font('Arial', 20),
+            get_font('Arial', 20))
+
+    def test_distinguishes_sizes(self):
+        self.assertIsNot(
+            get_font('Arial', 20),
+            get_font('Arial', 30))
+
+class TestRenderText(TestCase):
+    def setUp(self):
+        pygame.font.init()
+        text_surfaces.clear()
+        self.font = get_font('Arial', 20)
+
+    def test_reuses_rendered_text(self):
+        first = render_text("Score: 10", self.font, (0, 0, 0))
+        second = render_text("Score: 10", self.font, [0, 0, 0])
+        self.assertIs(first, second)
+        self.assertEqual(text_surfaces.hits, 1)
+
+    def test_renders_changed_text(self):
+        first = render_text("Score: 10", self.font, (0, 0, 0))
+        second = render_text("Score: 20", self.font, (0, 0, 0))
+        self.assertIsNot(first, second)
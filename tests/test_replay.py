@@ -0,0 +1,77 @@
+import os
+import tempfile
+import pygame
+from unittest import TestCase
+
+from skater.game import Game
+from skater.replay import Recording, Replay
+from skater.simulation import InputState, Simulation
+
+OLLIE = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+INPUTS = [InputState()] * 100 + [InputState(events=[OLLIE])] + [InputState([pygame.K_RIGHT])] * 150 + [InputState([pygame.K_RIGHT, pygame.K_UP])] * 30
+
+def record(inputs):
+    """
+    Plays `inputs` in a simulation, returns the recording and the player's trajectory
+    """
+    simulation = Simulation()
+    simulation.game.recording = Recording()
+    trajectory = []
+    for input_state in inputs:
+        simulation.step(input_state)
+        trajectory.append((simulation.player.rect.x, simulation.player.rect.y))
+    return simulation.game.recording, trajectory
+
+class TestRecording(TestCase):
+    def test_records_every_tick(self):
+        recording, _ = record(INPUTS)
+        self.assertEqual(len(recording), len(INPUTS))
+        self.assertEqual([event.key for event in recording.inputs[100].events], [pygame.K_SPACE])
+        self.assertEqual(recording.inputs[-1].pressed, {pygame.K_RIGHT, pygame.K_UP})
+
+    def test_ignores_keys_not_used_by_the_game(self):
+        recording = Recording()
+        recording.record([], InputState([pygame.K_RIGHT, pygame.K_z]))
+        self.assertEqual(recording.inputs[0].pressed, {pygame.K_RIGHT})
+
+    def test_save_and_load(self):
+        recording, _ = record(INPUTS)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "replay.json")
+            recording.save(path)
+            loaded = Recording.load(path)
+
+        self.assertEqual(len(loaded), len(recording))
+        for original, copy in zip(recording.inputs, loaded.inputs):
+            self.assertEqual(original.pressed, copy.pressed)
+            self.assertEqual(
+                [(event.type, event.key) for event in original.events],
+                [(event.type, event.key) for event in copy.events])
+
+class TestReplay(TestCase):
+    def replay(self, recording, **kwargs):
+        game = Game()
+        trajectory = []
+        move = game.player.move
+        def traced_move(*args):
+            move(*args)
+            trajectory.append((game.player.rect.x, game.player.rect.y))
+        game.player.move = traced_move
+
+        ticks = Replay(recording, **kwargs).run(game, pygame.Surface((1280, 720)))
+        return ticks, trajectory
+
+    def test_reproduces_the_recorded_trajectory(self):
+        recording, trajectory = record(INPUTS)
+        ticks, replayed = self.replay(recording)
+        self.assertEqual(ticks, len(INPUTS))
+        self.assertEqual(replayed, trajectory)
+
+    def test_reproduces_the_trajectory_in_real_time(self):
+        recording, trajectory = record(INPUTS[:120])
+        _, replayed = self.replay(recording, realtime=True)
+        self.assertEqual(replayed, trajectory)
+
+    def test_rejects_a_different_tick(self):
+        with self.assertRaises(ValueError):
+            Replay(Recording(tick=1 / 60)).run(Game(), pygame.Surface((1280, 720)))
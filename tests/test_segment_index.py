@@ -0,0 +1,24 @@
+import random
+from unittest import TestCase
+
+from skater.segment_index import SegmentIndex
+
+class TestSegmentIndex(TestCase):
+    def test_query_matches_linear_scan(self):
+        rng = random.Random(0)
+        intervals = []
+        for _ in range(300):
+            low = rng.randint(-1000, 10000)
+            intervals.append((low, low + rng.randint(0, 800)))
+        index = SegmentIndex(intervals, key=lambda interval: interval)
+
+        for _ in range(200):
+            low = rng.randint(-1500, 10500)
+            high = low + rng.randint(0, 300)
+            expected = [interval for interval in intervals if interval[0] <= high and interval[1] >= low]
+            self.assertEqual(sorted(index.query(low, high)), sorted(expected))
+
+    def test_empty_index(self):
+        index = SegmentIndex([], key=lambda interval: interval)
+        self.assertEqual(len(index), 0)
+        self.assertEqual(index.query(0, 100), [])
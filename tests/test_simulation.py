@@ -0,0 +1,106 @@
+import pygame
+from unittest import TestCase
+
+from skater.game import Game
+from skater.image import Image
+from skater.obstacles import LineObstacle, Obstacle
+from skater.rendering.point import Point
+from skater.rendering.shape import rectangle
+from skater.simulation import InputState, Simulation
+
+RIGHT = InputState([pygame.K_RIGHT])
+
+class TestInputState(TestCase):
+    def test_indexing_tells_if_key_is_pressed(self):
+        self.assertTrue(RIGHT[pygame.K_RIGHT])
+        self.assertFalse(RIGHT[pygame.K_LEFT])
+
+class TestSimulation(TestCase):
+    def test_player_lands_on_the_floor(self):
+        simulation = Simulation()
+        simulation.run_for(200)
+        self.assertEqual(simulation.player.v_y, 0)
+        self.assertEqual(simulation.player.rect.bottom, 600)
+
+    def test_pressing_right_moves_the_player_right(self):
+        simulation = Simulation()
+        simulation.run_for(100)
+        x = simulation.player.rect.x
+        simulation.run_for(20, RIGHT)
+        self.assertGreater(simulation.player.rect.x, x)
+
+    def test_is_deterministic(self):
+        ollie = pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE)
+        inputs = [InputState()] * 100 + [InputState(events=[ollie])] + [RIGHT] * 100
+
+        trajectories = []
+        for _ in range(2):
+            simulation = Simulation()
+            trajectory = []
+            for input_state in inputs:
+                simulation.step(input_state)
+                trajectory.append((simulation.player.rect.x, simulation.player.rect.y))
+            trajectories.append(trajectory)
+
+        self.assertEqual(trajectories[0], trajectories[1])
+
+    def test_ollie_pressed_and_released_within_a_tick_jumps(self):
+        simulation = Simulation()
+        simulation.run_for(200)
+        simulation.step(InputState(events=[
+            pygame.event.Event(pygame.KEYDOWN, key=pygame.K_SPACE),
+            pygame.event.Event(pygame.KEYUP, key=pygame.K_SPACE)]))
+        self.assertLess(simulation.player.v_y, 0)
+
+    def test_player_rides_up_a_ramp(self):
+        game = Game()
+        game.new_level = False
+        game.gameboard.obstacles = [Obstacle(Image.create((3000, 50), (0, 0, 0)), x = 0, y = 600)]
+        ramp = LineObstacle(Point(400, 600), Point(1400, 400))
+        game.gameboard.lines = [ramp]
+
+        simulation = Simulation(game)
+        simulation.run_for(60)
+        simulation.run_for(150, RIGHT)
+
+        rect = simulation.player.rect
+        self.assertEqual(simulation.player.v_y, 0)
+        self.assertLess(rect.bottom, 500)
+        self.assertAlmostEqual(rect.bottom, ramp.edge.top_between(rect.left, rect.right), delta=1)
+
+    def test_fast_player_does_not_tunnel(self):
+        game = Game()
+        game.new_level = False
+        game.player.speed_unit = 300
+        floor = Obstacle(Image.create((3000, 2), (0, 0, 0)), x = 0, y = 600)
+        wall = Obstacle(Image.create((2, 400), (0, 0, 0)), x = 1000, y = 200)
+        game.gameboard.obstacles = [floor, wall]
+
+        simulation = Simulation(game)
+        simulation.run_for(100)
+        self.assertEqual(simulation.player.rect.bottom, 600)
+
+        simulation.run_for(20, RIGHT)
+        self.assertEqual(simulation.player.rect.right, 999)
+
+    def test_pixel_collision_lands_on_the_opaque_pixels(self):
+        # a ramp going down to the right, on a transparent background
+        surface = pygame.Surface((201, 201), flags=pygame.SRCALPHA)
+        pygame.draw.polygon(surface, (0, 0, 0), [(0, 0), (200, 200), (0, 200)])
+
+        bottoms = []
+        for pixel_collision in [False, True]:
+            game = Game(pixel_collision=pixel_collision)
+            game.new_level = False
+            ramp = Obstacle(Image(surface, rectangle(Point(0, 0), Point(200, 200))), x = 0, y = 550)
+            game.gameboard.obstacles = [ramp]
+
+            simulation = Simulation(game)
+            simulation.run_for(100)
+            self.assertEqual(simulation.player.v_y, 0)
+            bottoms.append(simulation.player.rect.bottom)
+
+        # the shapes stop the player on the box, the pixels only where the ramp is, right above it
+        self.assertEqual(bottoms[0], 550)
+        self.assertGreater(bottoms[1], 650)
+        self.assertEqual(ramp.pixel_distance_under(simulation.player), 0)